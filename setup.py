@@ -33,6 +33,6 @@ setuptools.setup(
     ],
     python_requires=">=3.6",
     install_requires=requirements,
-    extras_require={"develop": requirements_develop},
+    extras_require={"develop": requirements_develop, "cache": ["pyarrow"]},
     entry_points={"console_scripts": ["wl=worklog:run",]},
 )
@@ -1,20 +1,29 @@
+import logging
 import os
-from configparser import ConfigParser
 from io import StringIO
 import json
-import pkg_resources
 
 from worklog.breaks import AutoBreak
 import worklog.constants as wc
-from worklog.log import Log
 from worklog.parser import get_arg_parser
-from worklog.utils.time import calc_log_time
+from worklog.utils.config import load_config
 from worklog.utils.logger import configure_logger
-from worklog.dispatcher import dispatch
 
 
 try:
-    __version__ = pkg_resources.get_distribution("dcs-" + __name__).version
+    # importlib.metadata is much cheaper to import than pkg_resources, which
+    # noticeably delays every CLI call.
+    from importlib import metadata as _metadata
+except ImportError:  # Python < 3.8
+    _metadata = None  # type: ignore
+
+try:
+    if _metadata is not None:
+        __version__ = _metadata.version("dcs-" + __name__)
+    else:
+        import pkg_resources
+
+        __version__ = pkg_resources.get_distribution("dcs-" + __name__).version
 except Exception:
     __version__ = "unknown"
 
@@ -28,23 +37,28 @@ def run() -> None:
     log_level = wc.LOG_LEVELS[min(cli_args.verbosity, len(wc.LOG_LEVELS) - 1)]
     logger.setLevel(log_level)
 
-    logger.debug(f"Parsed CLI arguments: {cli_args}")
-    logger.debug(f"Path to config files: {wc.CONFIG_FILES}")
+    logger.debug("Parsed CLI arguments: %s", cli_args)
+    logger.debug("Path to config files: %s", wc.CONFIG_FILES)
 
     if cli_args.subcmd is None:
         parser.print_help()
         return
 
-    cfg = ConfigParser()
-    cfg.read(wc.CONFIG_FILES)
+    # Deferred imports: the log and its dependencies (pandas) are only needed
+    # once a subcommand has been selected.
+    from worklog.log import Log
+    from worklog.dispatcher import dispatch
+
+    cfg = load_config(wc.CONFIG_FILES)
 
-    with StringIO() as ss:
-        cfg.write(ss)
-        ss.seek(0)
-        logger.debug(f"Config content:\n{ss.read()}\nEOF")
+    if logger.isEnabledFor(logging.DEBUG):
+        with StringIO() as ss:
+            cfg.write(ss)
+            ss.seek(0)
+            logger.debug("Config content:\n%s\nEOF", ss.read())
 
     worklog_fp = os.path.expanduser(cfg.get("worklog", "path"))
-    log = Log(worklog_fp)
+    log = Log(worklog_fp, cache_dir=wc.CACHE_DIR)
 
     limits = json.loads(cfg.get("workday", "auto_break_limit_minutes"))
     durations = json.loads(cfg.get("workday", "auto_break_duration_minutes"))
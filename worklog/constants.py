@@ -11,8 +11,16 @@ CONFIG_FILES: List[str] = [
     os.path.expanduser("~/.config/worklog/config"),
 ]
 
+CACHE_DIR: str = os.path.join(
+    os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "worklog"
+)
+CONFIG_CACHE_FILE: str = os.path.join(CACHE_DIR, "cfg.pkl")
+
 LOCAL_TIMEZONE: Optional[tzinfo] = datetime.now(timezone.utc).astimezone().tzinfo
 
+# Format of datetimes in the logfile, e.g. 2020-01-01 08:00:00+00:00
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S%z"
+
 DEFAULT_LOGGER_NAME = "worklog"
 
 SUBCMD_SESSION = "session"
@@ -1,6 +1,7 @@
 from configparser import ConfigParser
 from argparse import ArgumentParser, Namespace
 from datetime import date, timedelta
+from typing import Callable, Dict
 import json
 
 import worklog.constants as wc
@@ -15,51 +16,76 @@ def dispatch(
     Dispatch request to Log instance based on CLI arguments and
     configuration values.
     """
-    if cli_args.subcmd == wc.SUBCMD_SESSION:
-        if cli_args.type in [wc.TOKEN_START, wc.TOKEN_STOP]:
-            log.commit(
-                wc.TOKEN_SESSION,
-                cli_args.type,
-                cli_args.offset_minutes,
-                cli_args.time,
-                force=cli_args.force,
-            )
-    elif cli_args.subcmd == wc.SUBCMD_TASK:
-        if cli_args.type in [wc.TOKEN_START, wc.TOKEN_STOP]:
-            if cli_args.type == wc.TOKEN_START and cli_args.auto_stop:
-                commit_dt = calc_log_time(cli_args.offset_minutes, cli_args.time)
-                log.stop_active_tasks(commit_dt)
-            log.commit(
-                wc.TOKEN_TASK,
-                cli_args.type,
-                cli_args.offset_minutes,
-                cli_args.time,
-                identifier=cli_args.id,
-            )
-        elif cli_args.type == "list":
-            log.list_tasks()
-        elif cli_args.type == "report":
-            log.task_report(cli_args.id)
-    elif cli_args.subcmd == wc.SUBCMD_STATUS:
-        hours_target = float(cfg.get("workday", "hours_target"))
-        hours_max = float(cfg.get("workday", "hours_max"))
-        fmt = cli_args.fmt
-        query_date = date.today()
-        if cli_args.yesterday:
-            query_date -= timedelta(days=1)
-        elif cli_args.date:
-            query_date = cli_args.date.date()
-        log.status(hours_target, hours_max, query_date=query_date, fmt=fmt)
-    elif cli_args.subcmd == wc.SUBCMD_DOCTOR:
-        log.doctor()
-    elif cli_args.subcmd == wc.SUBCMD_LOG:
-        n = cli_args.number
-        no_pager_max_entries = int(cfg.get("worklog", "no_pager_max_entries"))
-        use_pager = not cli_args.no_pager and (cli_args.all or n > no_pager_max_entries)
-        categories = cli_args.category
-        if not cli_args.all:
-            log.log(cli_args.number, use_pager, categories)
-        else:
-            log.log(-1, use_pager, categories)
-    elif cli_args.subcmd == wc.SUBCMD_REPORT:
-        log.report(cli_args.date_from, cli_args.date_to)
+    handler = _HANDLERS.get(cli_args.subcmd)
+    if handler is not None:
+        handler(log, cli_args, cfg)
+
+
+def _dispatch_session(log: Log, cli_args: Namespace, cfg: ConfigParser) -> None:
+    if cli_args.type in [wc.TOKEN_START, wc.TOKEN_STOP]:
+        log.commit(
+            wc.TOKEN_SESSION,
+            cli_args.type,
+            cli_args.offset_minutes,
+            cli_args.time,
+            force=cli_args.force,
+        )
+
+
+def _dispatch_task(log: Log, cli_args: Namespace, cfg: ConfigParser) -> None:
+    if cli_args.type in [wc.TOKEN_START, wc.TOKEN_STOP]:
+        if cli_args.type == wc.TOKEN_START and cli_args.auto_stop:
+            commit_dt = calc_log_time(cli_args.offset_minutes, cli_args.time)
+            log.stop_active_tasks(commit_dt)
+        log.commit(
+            wc.TOKEN_TASK,
+            cli_args.type,
+            cli_args.offset_minutes,
+            cli_args.time,
+            identifier=cli_args.id,
+        )
+    elif cli_args.type == "list":
+        log.list_tasks()
+    elif cli_args.type == "report":
+        log.task_report(cli_args.id)
+
+
+def _dispatch_status(log: Log, cli_args: Namespace, cfg: ConfigParser) -> None:
+    hours_target = cfg.getfloat("workday", "hours_target")
+    hours_max = cfg.getfloat("workday", "hours_max")
+    fmt = cli_args.fmt
+    query_date = date.today()
+    if cli_args.yesterday:
+        query_date -= timedelta(days=1)
+    elif cli_args.date:
+        query_date = cli_args.date.date()
+    log.status(hours_target, hours_max, query_date=query_date, fmt=fmt)
+
+
+def _dispatch_doctor(log: Log, cli_args: Namespace, cfg: ConfigParser) -> None:
+    log.doctor()
+
+
+def _dispatch_log(log: Log, cli_args: Namespace, cfg: ConfigParser) -> None:
+    n = cli_args.number
+    no_pager_max_entries = cfg.getint("worklog", "no_pager_max_entries")
+    use_pager = not cli_args.no_pager and (cli_args.all or n > no_pager_max_entries)
+    categories = cli_args.category
+    if not cli_args.all:
+        log.log(cli_args.number, use_pager, categories)
+    else:
+        log.log(-1, use_pager, categories)
+
+
+def _dispatch_report(log: Log, cli_args: Namespace, cfg: ConfigParser) -> None:
+    log.report(cli_args.date_from, cli_args.date_to)
+
+
+_HANDLERS: Dict[str, Callable[[Log, Namespace, ConfigParser], None]] = {
+    wc.SUBCMD_SESSION: _dispatch_session,
+    wc.SUBCMD_TASK: _dispatch_task,
+    wc.SUBCMD_STATUS: _dispatch_status,
+    wc.SUBCMD_DOCTOR: _dispatch_doctor,
+    wc.SUBCMD_LOG: _dispatch_log,
+    wc.SUBCMD_REPORT: _dispatch_report,
+}
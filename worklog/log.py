@@ -1,23 +1,34 @@
+import csv
+import hashlib
 import logging
-import subprocess
+import os
 import sys
 import tempfile
-from datetime import date, datetime, timedelta, timezone
-from io import StringIO
-from math import floor
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import List, Optional, Tuple
-from collections import Counter
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np  # type: ignore
 import pandas as pd  # type: ignore
+from pandas.api.types import is_datetime64_any_dtype  # type: ignore
 
 from worklog.breaks import AutoBreak
 import worklog.constants as wc
 from worklog.utils.pager import get_pager
-from worklog.utils.time import now_localtz, calc_log_time, extract_date_and_time
-from worklog.utils.schema import empty_df_from_schema, get_datetime_cols_from_schema
-from worklog.utils.formatting import format_timedelta
+from worklog.utils.time import (
+    now_localtz,
+    calc_log_time,
+    assign_date_and_time,
+    parse_datetimes,
+    parse_datetimes_with_date_and_time,
+    normalize_datetimes,
+)
+from worklog.utils.schema import build_schema
+from worklog.utils.formatting import (
+    format_timedelta,
+    format_timedeltas,
+    iter_table_lines,
+)
 from worklog.utils.tasks import (
     calc_task_durations,
     extract_intervals,
@@ -33,19 +44,52 @@ from worklog.errors import ErrMsg
 
 
 class Log(object):
-    # In-memory representation of log
-    _log_df: pd.DataFrame = None
+    # In-memory representation of log, see `_log_df`
+    _df: pd.DataFrame = None
+    _pending_records: List[Tuple] = []
+    # Active task ids per date, see `_get_active_task_ids`
+    _active_tasks_cache: Dict[date, List[str]] = {}
 
     # Backend file config
     _log_fp: Optional[str] = None
+    _cache_fp: Optional[str] = None
+    _cache_signature_key: bytes = b"worklog.signature"
     _separator: Optional[str] = None
     _schema: List[Tuple[str, str]] = [
         (wc.COL_COMMIT_DATETIME, "datetime64[ns]",),
         (wc.COL_LOG_DATETIME, "datetime64[ns]",),
-        (wc.COL_CATEGORY, "object",),
-        (wc.COL_TYPE, "object",),
+        (wc.COL_CATEGORY, "category",),
+        (wc.COL_TYPE, "category",),
         (wc.COL_TASK_IDENTIFIER, "object",),
     ]
+    _columns: List[str] = [col for col, _ in _schema]
+    # Both are derived from the schema in a single pass. The empty DataFrame
+    # is a template, copy it before use.
+    _empty_df: pd.DataFrame
+    _datetime_columns: List[str]
+    _empty_df, _datetime_columns = build_schema(_schema)
+    # Largest UTC offset in use, see `_filter_date_category_limit_cols`
+    _max_utc_offset: timedelta = timedelta(hours=14)
+    _task_columns: List[str] = [
+        wc.COL_LOG_DATETIME,
+        wc.COL_TYPE,
+        wc.COL_TASK_IDENTIFIER,
+    ]
+
+    # Default output of `status`
+    _status_lines: List[Tuple[str, str]] = [
+        ("Status", "Tracking {tracking_status}"),
+        ("Total time", "{total_time} ({percentage_done:3}%)"),
+        ("Remaining time", "{remaining_time} ({percentage_remaining:3}%)"),
+        ("Overtime", "{overtime} ({percentage_overtime:3}%)"),
+        ("Break Duration", "{break_duration}"),
+        ("Touched tasks", "{touched_tasks_stats}",),
+        ("Active tasks", "{active_tasks_stats}",),
+    ]
+    _status_line_eow: Tuple[str, str] = ("End of work", "{eow}")
+    _status_key_width: int = max(
+        len(key) for key, _ in _status_lines + [_status_line_eow]
+    )
 
     # Error messages
     _err_msg_log_data_missing_for_date_short = "N/A"
@@ -54,18 +98,73 @@ class Log(object):
     auto_break: AutoBreak = AutoBreak()
 
     def __init__(
-        self, fp: str, separator: str = "|", logger: Optional[logging.Logger] = None
+        self,
+        fp: str,
+        separator: str = "|",
+        logger: Optional[logging.Logger] = None,
+        cache_dir: Optional[str] = None,
     ) -> None:
         self._log_fp = fp
         self._separator = separator
-
-        Path(self._log_fp).touch(mode=0o660)
-        self._read()
+        if cache_dir is not None:
+            key = hashlib.sha1(os.path.abspath(fp).encode()).hexdigest()
+            self._cache_fp = os.path.join(cache_dir, f"log-{key}.feather")
+        self._pending_records = []
+        self._active_tasks_cache = {}
+
+        # Only create the logfile here, the log itself is read on first
+        # access, see `_log_df`.
+        if not os.path.exists(fp):
+            Path(fp).touch(mode=0o660)
         if logger is not None:
             self.logger = logger
         else:
             self.logger = logging.getLogger(wc.DEFAULT_LOGGER_NAME)
 
+    @property
+    def _log_df(self) -> pd.DataFrame:
+        """
+        In-memory representation of the log.
+        Records that have been committed since the last access are merged
+        into the DataFrame lazily and in a single step.
+        The logfile is only read once the log is accessed for the first time,
+        so commands that merely append to the log do not need to parse it.
+        """
+        if self._df is None:
+            self._read()
+        if len(self._pending_records) > 0:
+            records = pd.DataFrame(self._pending_records, columns=self._columns)
+            # Take date and time before the datetimes are normalized, which
+            # would convert records with different UTC offsets.
+            assign_date_and_time(records)
+            for col in self._datetime_columns:
+                records[col] = normalize_datetimes(records[col])
+            records = records.sort_values(by=[wc.COL_LOG_DATETIME], kind="stable")
+            self._pending_records = []
+
+            n = self._df.shape[0]
+            if n == 0:
+                self._df = records.reset_index(drop=True)
+            else:
+                df = pd.concat((self._df, records), ignore_index=True)
+                if not is_datetime64_any_dtype(df[wc.COL_LOG_DATETIME]):
+                    # The new records use a different UTC offset than the
+                    # existing ones, see `parse_datetimes`.
+                    for col in self._datetime_columns:
+                        df[col] = normalize_datetimes(df[col])
+
+                # Because we allow for time offsets the new records are not
+                # necessarily the latest ones. In that case insert them at
+                # their sorted positions, which are found by a binary search
+                # in the (sorted) existing log, instead of re-sorting the log.
+                log_dts = df[wc.COL_LOG_DATETIME]
+                if log_dts.iat[n] < log_dts.iat[n - 1]:
+                    pos = log_dts.iloc[:n].searchsorted(log_dts.iloc[n:], side="right")
+                    order = np.insert(np.arange(n), pos, np.arange(n, df.shape[0]))
+                    df = df.iloc[order].reset_index(drop=True)
+                self._df = df
+        return self._df
+
     def commit(
         self,
         category: str,
@@ -81,31 +180,31 @@ class Log(object):
 
     def doctor(self) -> None:
         """Test if the logfile is consistent."""
-        mask_session = self._log_df[wc.COL_CATEGORY] == wc.TOKEN_SESSION
-        mask_task = self._log_df[wc.COL_CATEGORY] == wc.TOKEN_TASK
+        categories = self._log_df[wc.COL_CATEGORY].values
+        mask_session = categories == wc.TOKEN_SESSION
+        mask_task = categories == wc.TOKEN_TASK
 
         # sessions only
-        self._log_df[mask_session].groupby(["date"]).apply(
-            lambda group: check_order_session(group, self.logger)
-        )
+        df_session = self._log_df[mask_session]
+        for idx in df_session.groupby("date").indices.values():
+            check_order_session(df_session.iloc[idx], self.logger)
 
         # tasks only
-        self._log_df[mask_task].groupby(["date", "identifier"]).apply(
-            lambda group: check_order_session(
-                group, self.logger, task_id=group[wc.COL_TASK_IDENTIFIER].iloc[0]
-            )
-        )
+        df_task = self._log_df[mask_task]
+        for (_, task_id), idx in df_task.groupby(
+            ["date", wc.COL_TASK_IDENTIFIER]
+        ).indices.items():
+            check_order_session(df_task.iloc[idx], self.logger, task_id=task_id)
 
     def list_tasks(self):
         """List all known tasks, i.e. tasks that have been used previously
         and are stored in the logfile."""
-        mask_task = self._log_df[wc.COL_CATEGORY] == wc.TOKEN_TASK
+        mask_task = self._log_df[wc.COL_CATEGORY].values == wc.TOKEN_TASK
         task_df = self._log_df[mask_task]
-        task_counter = Counter(task_df[wc.COL_TASK_IDENTIFIER])
+        task_counts = task_df[wc.COL_TASK_IDENTIFIER].value_counts(sort=False)
 
         sys.stdout.write("These tasks are listed in the log:\n")
-        for task in sorted(task_counter.keys()):
-            count = task_counter[task]
+        for task, count in sorted(task_counts.items()):
             sys.stdout.write(f"{task} ({count})\n")
 
     def log(
@@ -117,35 +216,43 @@ class Log(object):
             return
 
         fields = ["date", "time", wc.COL_CATEGORY, wc.COL_TYPE, wc.COL_TASK_IDENTIFIER]
-        df = self._log_df[fields].iloc[::-1]  # sort in reverse (latest first)
-        df[wc.COL_TASK_IDENTIFIER] = df[wc.COL_TASK_IDENTIFIER].fillna("-")
+        df = self._log_df
         if filter_category:
-            df = df[df[wc.COL_CATEGORY] == filter_category]
+            df = df[df[wc.COL_CATEGORY].values == filter_category]
         if n > 0:
-            df = df.head(n=n)
-        if not use_pager:
-            sys.stdout.write(df.to_string(index=False) + "\n")
+            df = df.tail(n=n)
+        df = df[fields].iloc[::-1]  # sort in reverse (latest first)
+        df[wc.COL_TASK_IDENTIFIER] = df[wc.COL_TASK_IDENTIFIER].fillna("-")
+        pager = get_pager() if use_pager else None
+        if pager is None:
+            sys.stdout.writelines(iter_table_lines(df))
         else:
-            with tempfile.NamedTemporaryFile(mode="w") as fh:
-                self.logger.debug(f"Write content to temporary file: {fh.name}")
-                fh.write(df.to_string(index=False))
-                fh.flush()
-                pager = get_pager()
-                if pager is None:
-                    sys.stdout.write(df.to_string(index=False) + "\n")
-                else:
-                    self.logger.debug(f"Set pager to {pager}")
-                    process = subprocess.Popen([pager, fh.name])
-                    process.wait()
+            import subprocess
+
+            self.logger.debug(f"Set pager to {pager}")
+            # Stream the content to the pager line by line instead of going
+            # through a temporary file.
+            process = subprocess.Popen(
+                [pager], stdin=subprocess.PIPE, universal_newlines=True
+            )
+            try:
+                process.stdin.writelines(iter_table_lines(df))
+                process.stdin.close()
+            except BrokenPipeError:
+                pass  # pager has been closed before all lines were written
+            process.wait()
 
     def report(self, date_from: datetime, date_to: datetime):
         """Generate a daily, weekly, monthly and task based report based on
         the content in the logfile."""
-        session_mask = self._log_df[wc.COL_CATEGORY] == wc.TOKEN_SESSION
-        task_mask = self._log_df[wc.COL_CATEGORY] == wc.TOKEN_TASK
-        time_mask = (self._log_df[wc.COL_LOG_DATETIME] >= date_from) & (
-            self._log_df[wc.COL_LOG_DATETIME] < date_to
-        )
+        categories = self._log_df[wc.COL_CATEGORY].values
+        session_mask = categories == wc.TOKEN_SESSION
+        task_mask = categories == wc.TOKEN_TASK
+        # The log is sorted by log_dt, so the time range is a contiguous slice
+        # whose bounds can be found by a binary search.
+        lo, hi = self._log_df[wc.COL_LOG_DATETIME].searchsorted([date_from, date_to])
+        time_mask = np.zeros(self._log_df.shape[0], dtype=bool)
+        time_mask[lo:hi] = True
 
         # Day aggregation
         df_day = self._aggregate_time(time_mask & session_mask, resample="D")
@@ -227,64 +334,52 @@ class Log(object):
         is_active = is_active_session(df_day)
         self.logger.debug(f"Is active: {is_active}")
 
-        df_day = self._add_sentinel(query_date, df_day)
-        facts = self._calc_facts(df_day, hours_target, hours_max)
+        now = now_localtz()
+        log_dts, types = self._add_sentinel(query_date, df_day, now)
+        facts = self._calc_facts(log_dts, types, hours_target, hours_max, now)
 
-        date_mask = self._log_df["date"] == query_date
-        task_mask = self._log_df[wc.COL_CATEGORY] == wc.TOKEN_TASK
-        sel_task_mask = date_mask & task_mask
-        touched_tasks = get_all_task_ids_with_duration(self._log_df[sel_task_mask])
-        active_tasks = get_active_task_ids(self._log_df[sel_task_mask])
-
-        lines = [
-            ("Status", "Tracking {tracking_status}"),
-            ("Total time", "{total_time} ({percentage_done:3}%)"),
-            ("Remaining time", "{remaining_time} ({percentage_remaining:3}%)"),
-            ("Overtime", "{overtime} ({percentage_overtime:3}%)"),
-            ("Break Duration", "{break_duration}"),
-            ("Touched tasks", "{touched_tasks_stats}",),
-            ("Active tasks", "{active_tasks_stats}",),
-        ]
-
-        if is_active and date == "today":
-            lines += [("End of work", "{eow}",)]
+        df_tasks = self._filter_date_category_limit_cols(
+            query_date, wc.TOKEN_TASK, self._task_columns
+        )
+        touched_tasks = get_all_task_ids_with_duration(df_tasks)
+        active_tasks = self._get_active_task_ids(query_date)
 
-        key_max_len = max([len(line[0]) for line in lines])
-        fmt_string = "{:" + str(key_max_len + 1) + "s}: {}"
+        lines = self._status_lines
+        if is_active and query_date == now.date():
+            lines = lines + [self._status_line_eow]
 
+        fmt_string = "{:" + str(self._status_key_width + 1) + "s}: {}"
         stdout_fmt = "\n".join(fmt_string.format(*line) for line in lines) + "\n"
 
+        active_tasks_str = ", ".join(active_tasks)
+        touched_tasks_str = ", ".join(touched_tasks.keys())
+        touched_tasks_durations_str = ", ".join(
+            f"{k} ({format_timedelta(v)})" for k, v in touched_tasks.items()
+        )
+
         sys.stdout.write(
             (stdout_fmt if fmt is None else fmt).format(
                 **facts,
-                active_tasks=", ".join(active_tasks),
-                active_tasks_stats=f"({len(active_tasks)}) ["
-                + ", ".join(active_tasks)
-                + "]",
-                touched_tasks=", ".join(touched_tasks.keys()),
-                touched_tasks_stats=f"({len(touched_tasks)}) ["
-                + ", ".join(
-                    [f"{k} ({format_timedelta(v)})" for k, v in touched_tasks.items()]
-                )
-                + "]",
+                active_tasks=active_tasks_str,
+                active_tasks_stats=f"({len(active_tasks)}) [{active_tasks_str}]",
+                touched_tasks=touched_tasks_str,
+                touched_tasks_stats=(
+                    f"({len(touched_tasks)}) [{touched_tasks_durations_str}]"
+                ),
                 tracking_status="on" if is_active else "off",
             )
         )
 
     def stop_active_tasks(self, log_dt: datetime):
         """Stop all active tasks by commiting changes to the logfile."""
-        query_date = log_dt.date()
-        task_mask = self._log_df[wc.COL_CATEGORY] == wc.TOKEN_TASK
-        date_mask = self._log_df["date"] == query_date
-        mask = task_mask & date_mask
-        active_task_ids = get_active_task_ids(self._log_df[mask])
+        active_task_ids = self._get_active_task_ids(log_dt.date())
         for task_id in active_task_ids:
             self._commit(wc.TOKEN_TASK, wc.TOKEN_STOP, log_dt, identifier=task_id)
 
     def task_report(self, task_id):
         """Generate a report of a given task."""
-        task_mask = self._log_df[wc.COL_CATEGORY] == wc.TOKEN_TASK
-        task_id_mask = self._log_df[wc.COL_TASK_IDENTIFIER] == task_id
+        task_mask = self._log_df[wc.COL_CATEGORY].values == wc.TOKEN_TASK
+        task_id_mask = self._log_df[wc.COL_TASK_IDENTIFIER].values == task_id
         mask = task_mask & task_id_mask
         task_df = self._log_df[mask]
 
@@ -297,29 +392,18 @@ class Log(object):
             )
             exit(1)
 
-        intervals = extract_intervals(task_df, logger=logger)
+        intervals = extract_intervals(task_df, logger=self.logger)
 
-        intervals_detailed = intervals[["date", "start", "stop", "interval"]].rename(
-            columns={
-                "date": "Date",
-                "start": "Start",
-                "stop": "Stop",
-                "interval": "Duration",
+        intervals_detailed = pd.DataFrame(
+            {
+                "Date": intervals["date"],
+                "Start": pd.to_datetime(intervals["start"]).dt.strftime("%H:%M:%S"),
+                "Stop": pd.to_datetime(intervals["stop"]).dt.strftime("%H:%M:%S"),
+                "Duration": format_timedeltas(intervals["interval"]),
             }
         )
         print("Log entries:\n")
-        print(
-            intervals_detailed.to_string(
-                index=False,
-                formatters={
-                    "Start": lambda x: x.strftime("%H:%M:%S"),
-                    "Stop": lambda x: x.strftime("%H:%M:%S"),
-                    "Duration": lambda x: format_timedelta(
-                        timedelta(microseconds=int(x) / 1e3)
-                    ),
-                },
-            )
-        )
+        print(intervals_detailed.to_string(index=False))
 
         print("---")
         print("Daily aggregated:\n")
@@ -328,36 +412,150 @@ class Log(object):
         intervals_daily = intervals_daily.rename(columns={"interval": "Duration"})
         print(intervals_daily.to_string())
 
-        print(f"---\nTotal: {intervals_detailed['Duration'].sum()}")
+        print(f"---\nTotal: {intervals['interval'].sum()}")
 
     def _read(self) -> None:
         """
         Read data from input file.
-        This method uses `pandas.read_csv` to parse the data.
+        If a cache directory is configured, a binary copy of the parsed log
+        is kept there and used instead of the input file as long as the input
+        file has not been modified since, see `_log_signature`.
+        """
+        # Take the signature before reading, so that a concurrent change of
+        # the logfile invalidates the cache instead of being masked by it.
+        signature = self._log_signature()
+        df = self._read_cache(signature)
+        if df is None:
+            df = self._read_csv()
+            self._write_cache(df, signature)
+
+        self._df = df
+
+    def _log_signature(self) -> Optional[str]:
+        """
+        Returns the modification time and size of the logfile, which identify
+        the version of the logfile a cache has been created from.
         """
-        date_cols = get_datetime_cols_from_schema(self._schema)
-        header = [col for col, _ in self._schema]
         try:
-            self._log_df = pd.read_csv(
-                self._log_fp,
-                sep=self._separator,
-                parse_dates=date_cols,
-                header=None,
-                names=header,
-                comment="#",
-            ).sort_values(by=[wc.COL_LOG_DATETIME])
-        except pd.errors.EmptyDataError:
-            self._log_df = empty_df_from_schema(self._schema)
-
-        self._log_df = pd.concat(
-            [self._log_df, extract_date_and_time(self._log_df)], axis=1
-        )
+            stat = os.stat(self._log_fp)
+        except OSError:
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
 
-    def _persist(self, df: pd.DataFrame, mode="a") -> None:
-        cols = [col for col, _ in self._schema]
-        df[cols].to_csv(
-            self._log_fp, mode=mode, sep=self._separator, index=False, header=False
-        )
+    def _read_csv(self) -> pd.DataFrame:
+        """
+        Parse the input file.
+        This method uses the builtin `csv` module to split the file into one
+        list per column, which are then handed over to pandas in a single
+        step. Comment lines (starting with '#') and empty lines are skipped.
+        """
+        cols = self._columns
+        data: Dict[str, List] = {col: [] for col in cols}
+        with open(self._log_fp, "r", newline="") as fh:
+            for row in csv.reader(fh, delimiter=self._separator):
+                if not row or row[0].startswith("#"):
+                    continue
+                for i, col in enumerate(cols):
+                    data[col].append(row[i] if i < len(row) and row[i] else None)
+
+        if len(data[wc.COL_LOG_DATETIME]) == 0:
+            df = self._empty_df.copy()
+            assign_date_and_time(df)
+            return df
+
+        # Use the dtypes from the schema to skip pandas' dtype inference.
+        for col, dtype in self._schema:
+            if col == wc.COL_LOG_DATETIME:
+                (
+                    data[col],
+                    data["date"],
+                    data["time"],
+                ) = parse_datetimes_with_date_and_time(data[col])
+            elif col in self._datetime_columns:
+                data[col] = parse_datetimes(data[col])
+            else:
+                data[col] = pd.Series(data[col], dtype=dtype)
+        df = pd.DataFrame(data)
+        # Entries are appended in order unless they have been backdated,
+        # so the file is usually sorted already.
+        if not df[wc.COL_LOG_DATETIME].is_monotonic_increasing:
+            df = df.sort_values(by=[wc.COL_LOG_DATETIME])
+        return df
+
+    def _read_cache(self, signature: Optional[str]) -> Optional[pd.DataFrame]:
+        """
+        Returns the cached log or None if there is no cache matching the given
+        signature of the logfile.
+        Caching requires the optional dependency `pyarrow`.
+        """
+        if self._cache_fp is None or signature is None:
+            return None
+        try:
+            from pyarrow import feather  # type: ignore
+
+            table = feather.read_table(self._cache_fp)
+            metadata = table.schema.metadata or {}
+            if metadata.get(self._cache_signature_key) != signature.encode():
+                return None
+            return table.to_pandas()
+        except (OSError, ImportError, ValueError):
+            return None
+
+    def _write_cache(self, df: pd.DataFrame, signature: Optional[str]) -> None:
+        """
+        Stores the parsed log together with the signature of the logfile.
+        The cache is only readable by the owner, as it contains a full copy of
+        the log, and it is replaced atomically.
+        """
+        if self._cache_fp is None or signature is None:
+            return
+        tmp_fp = None
+        try:
+            import pyarrow as pa  # type: ignore
+            from pyarrow import feather  # type: ignore
+
+            table = pa.Table.from_pandas(
+                df.reset_index(drop=True), preserve_index=False
+            )
+            metadata = dict(table.schema.metadata or {})
+            metadata[self._cache_signature_key] = signature.encode()
+            table = table.replace_schema_metadata(metadata)
+
+            cache_dir = os.path.dirname(self._cache_fp)
+            os.makedirs(cache_dir, exist_ok=True)
+            # mkstemp creates the file with mode 0o600
+            fd, tmp_fp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            os.close(fd)
+            feather.write_feather(table, tmp_fp)
+            os.replace(tmp_fp, self._cache_fp)
+        except (OSError, ImportError, ValueError):
+            # caching is optional, the logfile remains the source of truth
+            if tmp_fp is not None and os.path.exists(tmp_fp):
+                os.remove(tmp_fp)
+
+    def _append_row(
+        self,
+        commit_dt: datetime,
+        log_dt: datetime,
+        category: str,
+        type_: str,
+        identifier: Optional[str],
+    ) -> None:
+        """
+        Append a single record to the logfile.
+        Datetimes are written in the same ISO format that pandas uses, i.e.
+        `2020-01-01 08:00:00+00:00`.
+        """
+        with open(self._log_fp, "a", newline="") as fh:
+            csv.writer(fh, delimiter=self._separator, lineterminator="\n").writerow(
+                [
+                    commit_dt.isoformat(sep=" "),
+                    log_dt.isoformat(sep=" "),
+                    category,
+                    type_,
+                    identifier or "",
+                ]
+            )
 
     def _commit(
         self,
@@ -380,10 +578,7 @@ class Log(object):
 
         # Test if there are running tasks
         if category == wc.TOKEN_SESSION:
-            date_mask = self._log_df["date"] == log_dt.date()
-            task_mask = self._log_df[wc.COL_CATEGORY] == wc.TOKEN_TASK
-            mask = date_mask & task_mask
-            active_tasks = get_active_task_ids(self._log_df[mask])
+            active_tasks = self._get_active_task_ids(log_dt.date())
             if len(active_tasks) > 0:
                 if not force:
                     msg = ErrMsg.STOP_SESSION_TASKS_RUNNING.value.format(
@@ -395,26 +590,16 @@ class Log(object):
                     for task_id in active_tasks:
                         self._commit(wc.TOKEN_TASK, wc.TOKEN_STOP, log_dt, task_id)
 
-        cols = [col for col, _ in self._schema]
-        values = [
-            pd.to_datetime(commit_dt),
-            pd.to_datetime(log_dt),
-            category,
-            type_,
-            identifier,
-        ]
-
-        record = pd.DataFrame(dict(zip(cols, values)), index=[0],)
-        record_t = pd.concat([record, extract_date_and_time(record)], axis=1)
-
-        # append record to in-memory log
-        self._log_df = pd.concat((self._log_df, record_t))
+        # append record to in-memory log (merged lazily, see `_log_df`),
+        # unless the log has not been read yet. In that case the record is
+        # read from the logfile along with all others.
+        self._active_tasks_cache = {}
+        if self._df is not None:
+            self._pending_records.append(
+                (commit_dt, log_dt, category, type_, identifier)
+            )
         # and persist to disk
-        self._persist(record_t, mode="a")
-
-        # Because we allow for time offsets sorting is not guaranteed at this point.
-        # Update sorting of values in-memory.
-        self._log_df = self._log_df.sort_values(by=[wc.COL_LOG_DATETIME])
+        self._append_row(commit_dt, log_dt, category, type_, identifier)
 
     def _check_nonempty_or_exit(self, fmt: Optional[str]):
         """
@@ -442,37 +627,73 @@ class Log(object):
         `columns` parameter.
         """
         # Extract the day of interest by selecting a subset of the log
-        # dataframe that matches the queried day.
-        mask = (self._log_df.date == query_date) & (
-            self._log_df.category == filter_category
+        # dataframe that matches the queried day. Entries belong to the day
+        # of their wall-clock time, i.e. in their own UTC offset, which may
+        # differ between entries (e.g. daylight saving time). The log is
+        # sorted by `log_dt`, so a binary search narrows the log down to the
+        # entries that can be on the queried day in any UTC offset, and only
+        # those are compared by date.
+        log_dts = self._log_df[wc.COL_LOG_DATETIME]
+        day_start = pd.Timestamp(query_date)
+        if log_dts.dt.tz is not None:
+            day_start = day_start.tz_localize("UTC").tz_convert(log_dts.dt.tz)
+        lo, hi = log_dts.searchsorted(
+            [
+                day_start - self._max_utc_offset,
+                day_start + timedelta(days=1) + self._max_utc_offset,
+            ]
         )
-        df = self._log_df[mask]
-        df = df[columns]
-        return df
+        df = self._log_df.iloc[lo:hi]
+        mask = (df["date"].values == query_date) & (
+            df[wc.COL_CATEGORY].values == filter_category
+        )
+        return df.loc[mask, columns]
 
-    def _add_sentinel(self, query_date: date, df: pd.DataFrame):
-        is_active = is_active_session(df)
-        ret = df
-        if is_active:
-            sdt = sentinel_datetime(query_date)
-            # attach another row with the current time
-            sentinel_df = pd.DataFrame(
-                {
-                    wc.COL_LOG_DATETIME: pd.to_datetime(sdt.isoformat()),
-                    wc.COL_TYPE: wc.TOKEN_STOP,
-                },
-                index=[0],
+    def _get_active_task_ids(self, query_date: date) -> List[str]:
+        """
+        Returns the ids of the tasks that are active on the given date.
+        The result is cached until the next commit.
+        """
+        if query_date not in self._active_tasks_cache:
+            df_tasks = self._filter_date_category_limit_cols(
+                query_date, wc.TOKEN_TASK, self._task_columns
             )
-            ret = pd.concat((ret, sentinel_df))
-            self.logger.warning(f"Set sentinel stop value: {sdt}")
-        return ret
+            self._active_tasks_cache[query_date] = get_active_task_ids(df_tasks)
+        return self._active_tasks_cache[query_date]
 
-    def _calc_facts(self, df: pd.DataFrame, hours_target: float, hours_max: float):
-        shifted_dt = df[wc.COL_LOG_DATETIME].shift(1)
-        stop_mask = df[wc.COL_TYPE] == wc.TOKEN_STOP
+    def _add_sentinel(
+        self, query_date: date, df: pd.DataFrame, now: datetime
+    ) -> Tuple[List[datetime], List[str]]:
+        """
+        Returns the log datetimes and types of the given DataFrame as lists.
+        If the session is still active a stop entry with the current time is
+        appended to both lists.
+        """
+        log_dts = df[wc.COL_LOG_DATETIME].tolist()
+        types = df[wc.COL_TYPE].tolist()
+        if is_active_session(df):
+            sdt = sentinel_datetime(query_date, now)
+            log_dts.append(sdt)
+            types.append(wc.TOKEN_STOP)
+            self.logger.warning(f"Set sentinel stop value: {sdt}")
+        return log_dts, types
 
-        # calculate total working time
-        total_time = (df[stop_mask][wc.COL_LOG_DATETIME] - shifted_dt[stop_mask]).sum()
+    def _calc_facts(
+        self,
+        log_dts: List[datetime],
+        types: List[str],
+        hours_target: float,
+        hours_max: float,
+        now: datetime,
+    ):
+        # calculate total working time: each stop entry closes the interval
+        # since the previous entry. A stop entry at the first position has no
+        # previous entry and is skipped. Works on the int64 nanosecond
+        # representation of the log datetimes.
+        ts = pd.to_datetime(log_dts, utc=True).asi8
+        stop_mask = np.asarray(types, dtype=object)[1:] == wc.TOKEN_STOP
+        total_ns = int((ts[1:][stop_mask] - ts[:-1][stop_mask]).sum())
+        total_time = timedelta(microseconds=total_ns // 1000)
         total_time_str = format_timedelta(total_time)
 
         # calculate breaks
@@ -482,11 +703,6 @@ class Log(object):
         hours_max_dt = timedelta(hours=hours_max) + break_duration
 
         # calculate remaining time
-        now = (
-            datetime.now(timezone.utc)
-            .astimezone(tz=wc.LOCAL_TIMEZONE)
-            .replace(microsecond=0)
-        )
         eow_dt = now + (hours_target_dt - total_time)
         eow_str = eow_dt.strftime("%H:%M:%S")
         remaining_time = max(eow_dt - now, timedelta(minutes=0))
@@ -533,9 +749,9 @@ class Log(object):
         df = self._log_df[mask]
         df = df.sort_values([wc.COL_LOG_DATETIME, wc.COL_TYPE])
         shifted_dt = df[wc.COL_LOG_DATETIME].shift(1)
-        stop_mask = df[wc.COL_TYPE] == wc.TOKEN_STOP
-        agg_time = df[stop_mask][wc.COL_LOG_DATETIME] - shifted_dt[stop_mask]
-        ret = df[stop_mask][[wc.COL_LOG_DATETIME] + keep_cols]
+        stop_mask = df[wc.COL_TYPE].values == wc.TOKEN_STOP
+        ret = df.loc[stop_mask, [wc.COL_LOG_DATETIME] + keep_cols]
+        agg_time = ret[wc.COL_LOG_DATETIME] - shifted_dt[stop_mask]
         ret["agg_time"] = agg_time
         return ret
 
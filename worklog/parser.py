@@ -1,7 +1,8 @@
-from typing import List
-from datetime import datetime, timezone, timedelta
+from typing import Callable, Dict, List
+from datetime import datetime, timedelta
 import re
 import argparse
+from functools import lru_cache
 
 import worklog.constants as wc
 
@@ -13,10 +14,37 @@ _help_time_arg = (
 )
 
 
+class _LazySubParsersAction(argparse._SubParsersAction):
+    """
+    Subparsers action that defers adding the arguments of a subcommand until
+    this subcommand is selected on the command line. Only the parser of the
+    selected subcommand is populated, which also covers its help message.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._populators: Dict[str, Callable[[argparse.ArgumentParser], None]] = {}
+
+    def add_lazy_parser(
+        self, name: str, populate: Callable[[argparse.ArgumentParser], None], **kwargs
+    ) -> argparse.ArgumentParser:
+        parser = self.add_parser(name, **kwargs)
+        self._populators[name] = populate
+        return parser
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        populate = self._populators.pop(values[0], None)
+        if populate is not None:
+            populate(self._name_parser_map[values[0]])
+        super().__call__(parser, namespace, values, option_string)
+
+
+@lru_cache(maxsize=1)
 def get_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         "Worklog", description="Simple CLI tool to log work and projects."
     )
+    parser.register("action", "parsers", _LazySubParsersAction)
     parser.add_argument("-v", "--verbose", dest="verbosity", action="count", default=0)
 
     subparsers = parser.add_subparsers(dest="subcmd")
@@ -31,14 +59,18 @@ def get_arg_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def _add_session_parser(subparsers: argparse._SubParsersAction):
-    session_parser = subparsers.add_parser(
+def _add_session_parser(subparsers: _LazySubParsersAction):
+    subparsers.add_lazy_parser(
         wc.SUBCMD_SESSION,
+        _populate_session_parser,
         description=(
             "Commit the start or end of a new working session to the worklog file. "
             "Use this function to stamp in the morning and stamp out in the evening."
         ),
     )
+
+
+def _populate_session_parser(session_parser: argparse.ArgumentParser):
     session_parser.add_argument(
         "type",
         choices=[wc.TOKEN_START, wc.TOKEN_STOP],
@@ -53,15 +85,19 @@ def _add_session_parser(subparsers: argparse._SubParsersAction):
     )
 
 
-def _add_task_parser(subparsers: argparse._SubParsersAction):
-    task_parser = subparsers.add_parser(
+def _add_task_parser(subparsers: _LazySubParsersAction):
+    subparsers.add_lazy_parser(
         wc.SUBCMD_TASK,
+        _populate_task_parser,
         description=(
             "Tasks are pieces of work to be done or undertaken. "
             "A task can only be started during an ongoing session. "
             "Use 'wl session start' to start a new working session."
         ),
     )
+
+
+def _populate_task_parser(task_parser: argparse.ArgumentParser):
     task_parser_type = task_parser.add_subparsers(dest="type")
 
     # task start
@@ -94,9 +130,10 @@ def _add_task_parser(subparsers: argparse._SubParsersAction):
     )
 
 
-def _add_status_parser(subparsers: argparse._SubParsersAction):
-    status_parser = subparsers.add_parser(
+def _add_status_parser(subparsers: _LazySubParsersAction):
+    subparsers.add_lazy_parser(
         wc.SUBCMD_STATUS,
+        _populate_status_parser,
         description=(
             "The status commend shows the tracking results for an individual day. "
             "By default the current day is selected. "
@@ -104,6 +141,9 @@ def _add_status_parser(subparsers: argparse._SubParsersAction):
             "argument."
         ),
     )
+
+
+def _populate_status_parser(status_parser: argparse.ArgumentParser):
     status_time_grp = status_parser.add_mutually_exclusive_group()
     status_time_grp.add_argument(
         "--yesterday",
@@ -118,8 +158,8 @@ def _add_status_parser(subparsers: argparse._SubParsersAction):
     )
 
 
-def _add_doctor_parser(subparsers: argparse._SubParsersAction):
-    doctor_parser = subparsers.add_parser(
+def _add_doctor_parser(subparsers: _LazySubParsersAction):
+    subparsers.add_parser(
         wc.SUBCMD_DOCTOR,
         description=(
             "The doctor command checks the worklog for missing or problematic entries. "
@@ -128,15 +168,19 @@ def _add_doctor_parser(subparsers: argparse._SubParsersAction):
     )
 
 
-def _add_log_parser(subparsers: argparse._SubParsersAction):
-    log_parser = subparsers.add_parser(
+def _add_log_parser(subparsers: _LazySubParsersAction):
+    subparsers.add_lazy_parser(
         wc.SUBCMD_LOG,
+        _populate_log_parser,
         description=(
             "Shows the content of the worklog file sorted after the date and time of the "
             "entry. "
             "Use this command to manually review the content of the worklog."
         ),
     )
+
+
+def _populate_log_parser(log_parser: argparse.ArgumentParser):
     log_parser.add_argument(
         "-n",
         "--number",
@@ -167,19 +211,10 @@ def _add_log_parser(subparsers: argparse._SubParsersAction):
     )
 
 
-def _add_report_parser(subparsers: argparse._SubParsersAction):
-    now = (
-        datetime.now(timezone.utc)
-        .astimezone(tz=wc.LOCAL_TIMEZONE)
-        .replace(microsecond=0)
-    )
-    current_month: str = now.replace(day=1).isoformat()[: len("2000-01-01")]
-    next_month: str = (now.replace(day=1) + timedelta(days=31)).replace(
-        day=1
-    ).isoformat()[: len("2000-01-01")]
-
-    report_parser = subparsers.add_parser(
+def _add_report_parser(subparsers: _LazySubParsersAction):
+    subparsers.add_lazy_parser(
         wc.SUBCMD_REPORT,
+        _populate_report_parser,
         description=(
             "Creates a report for a given time window. "
             "Working time will be aggregated on a monthly, weekly and daily basis. "
@@ -187,6 +222,15 @@ def _add_report_parser(subparsers: argparse._SubParsersAction):
             "By default the current month will be used for the report."
         ),
     )
+
+
+def _populate_report_parser(report_parser: argparse.ArgumentParser):
+    now = datetime.now(wc.LOCAL_TIMEZONE).replace(microsecond=0)
+    current_month: str = now.replace(day=1).isoformat()[: len("2000-01-01")]
+    next_month: str = (now.replace(day=1) + timedelta(days=31)).replace(
+        day=1
+    ).isoformat()[: len("2000-01-01")]
+
     report_parser.add_argument(
         "--date-from",
         type=_combined_month_or_day_or_week_parser,
@@ -244,9 +288,9 @@ def _calendar_week_parser(value: str) -> datetime:
 
 def _positive_int(value: str) -> int:
     value_int = int(value)
-    if value_int <= 0:
-        raise argparse.ArgumentTypeError(f"{value} is not a positive int value.")
-    return value_int
+    if value_int > 0:
+        return value_int
+    raise argparse.ArgumentTypeError(f"{value} is not a positive int value.")
 
 
 def _add_timeshift_args(parser: argparse.ArgumentParser):
@@ -176,7 +176,7 @@ class TestDispatchReport(unittest.TestCase):
 @patch("worklog.log")
 class TestDispatchStatus(unittest.TestCase):
     def test_status(self, mock_log, mock_parser, mock_cfg):
-        mock_cfg.get.side_effect = ["8.0", "10.0"]
+        mock_cfg.getfloat.side_effect = [8.0, 10.0]
         ns = Namespace(subcmd="status", fmt=None, yesterday=False, date=None)
         dispatch(mock_log, mock_parser, ns, mock_cfg)
 
@@ -187,7 +187,7 @@ class TestDispatchStatus(unittest.TestCase):
         )
 
     def test_status_yesterday(self, mock_log, mock_parser, mock_cfg):
-        mock_cfg.get.side_effect = ["8.0", "10.0"]
+        mock_cfg.getfloat.side_effect = [8.0, 10.0]
         ns = Namespace(subcmd="status", fmt=None, yesterday=True, date=None)
         dispatch(mock_log, mock_parser, ns, mock_cfg)
 
@@ -198,7 +198,7 @@ class TestDispatchStatus(unittest.TestCase):
         )
 
     def test_status_fixed_date(self, mock_log, mock_parser, mock_cfg):
-        mock_cfg.get.side_effect = ["8.0", "10.0"]
+        mock_cfg.getfloat.side_effect = [8.0, 10.0]
         ns = Namespace(
             subcmd="status",
             fmt=None,
@@ -219,14 +219,14 @@ class TestDispatchStatus(unittest.TestCase):
 @patch("worklog.log")
 class TestDispatchLog(unittest.TestCase):
     def test_log_default(self, mock_log, mock_parser, mock_cfg):
-        mock_cfg.get.side_effect = ["10"]  # worklog.no_pager_max_entries
+        mock_cfg.getint.side_effect = [10]  # worklog.no_pager_max_entries
         ns = Namespace(subcmd="log", no_pager=False, all=False, category=None, number=5)
         dispatch(mock_log, mock_parser, ns, mock_cfg)
 
         mock_log.log.assert_called_once_with(5, False, None)
 
     def test_log_all(self, mock_log, mock_parser, mock_cfg):
-        mock_cfg.get.side_effect = ["10"]  # worklog.no_pager_max_entries
+        mock_cfg.getint.side_effect = [10]  # worklog.no_pager_max_entries
         ns = Namespace(subcmd="log", no_pager=False, all=True, category=None, number=5)
         dispatch(mock_log, mock_parser, ns, mock_cfg)
 
@@ -234,7 +234,7 @@ class TestDispatchLog(unittest.TestCase):
 
     def test_log_large_n(self, mock_log, mock_parser, mock_cfg):
         """It should automatically use pager if number > no_pager_max_entries"""
-        mock_cfg.get.side_effect = ["10"]  # worklog.no_pager_max_entries
+        mock_cfg.getint.side_effect = [10]  # worklog.no_pager_max_entries
         ns = Namespace(
             subcmd="log", no_pager=False, all=False, category=None, number=20
         )
@@ -1,12 +1,14 @@
 import unittest
+import importlib.util
 import pytest
 from unittest.mock import patch, Mock, call
 import tempfile
 from pathlib import Path
 import os
 import logging
-from datetime import datetime, timezone, date
+from datetime import datetime, timezone, timedelta, date, time
 import snapshottest
+import pandas as pd
 
 from worklog.breaks import AutoBreak
 from worklog.log import Log
@@ -46,6 +48,78 @@ class TestInit(unittest.TestCase, TestDataMixin):
         instance = Log(fp)
         self.assertFalse(instance._log_df.empty)
 
+    def test_unordered_file_is_sorted(self):
+        fp = self._get_testdata_fp("tasks_multiple_nested_unordered")
+        instance = Log(fp)
+        self.assertTrue(
+            instance._log_df[wc.COL_LOG_DATETIME].is_monotonic_increasing
+        )
+
+    def test_low_cardinality_columns_are_categorical(self):
+        fp = self._get_testdata_fp("tasks_multiple_nested_unordered")
+        instance = Log(fp)
+        self.assertEqual(instance._log_df[wc.COL_CATEGORY].dtype, "category")
+        self.assertEqual(instance._log_df[wc.COL_TYPE].dtype, "category")
+
+
+@unittest.skipIf(importlib.util.find_spec("pyarrow") is None, "requires pyarrow")
+class TestCache(unittest.TestCase, TestDataMixin):
+    def test_cache_is_written_and_used(self):
+        fp = self._get_testdata_fp("tasks_multiple_nested_unordered")
+        with tempfile.TemporaryDirectory() as cache_dir:
+            expected = Log(fp)._log_df
+            Log(fp, cache_dir=cache_dir)._log_df
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            with patch.object(Log, "_read_csv") as mock_read_csv:
+                actual = Log(fp, cache_dir=cache_dir)._log_df
+
+            mock_read_csv.assert_not_called()
+            pd.testing.assert_frame_equal(actual, expected.reset_index(drop=True))
+
+    def test_stale_cache_is_ignored(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fp = Path(tmpdir, "log").as_posix()
+            cache_dir = Path(tmpdir, "cache").as_posix()
+            instance = Log(fp, cache_dir=cache_dir)
+            instance.commit(
+                wc.TOKEN_SESSION, wc.TOKEN_START, time="2020-01-01T00:00:00+00:00"
+            )
+            # make sure the logfile is newer than the cache
+            cache_fp = Path(cache_dir, os.listdir(cache_dir)[0])
+            mtime_ns = cache_fp.stat().st_mtime_ns
+            os.utime(fp, ns=(mtime_ns + 1, mtime_ns + 1))
+
+            actual = Log(fp, cache_dir=cache_dir)._log_df
+
+            self.assertEqual(actual.shape[0], 1)
+
+    def test_replaced_logfile_with_older_mtime_is_read(self):
+        entry = "2020-01-01 00:00:00+00:00|2020-01-01 00:00:00+00:00|session|{}|\n"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fp = Path(tmpdir, "log")
+            cache_dir = Path(tmpdir, "cache").as_posix()
+            fp.write_text(entry.format(wc.TOKEN_START))
+            Log(fp.as_posix(), cache_dir=cache_dir)._log_df
+
+            # e.g. restoring a backup with `cp -p`
+            mtime_ns = fp.stat().st_mtime_ns
+            fp.write_text(entry.format(wc.TOKEN_START) + entry.format(wc.TOKEN_STOP))
+            os.utime(fp, ns=(mtime_ns - 10 ** 9, mtime_ns - 10 ** 9))
+
+            actual = Log(fp.as_posix(), cache_dir=cache_dir)._log_df
+
+            self.assertEqual(actual.shape[0], 2)
+
+    def test_cache_is_private(self):
+        fp = self._get_testdata_fp("tasks_multiple_nested_unordered")
+        with tempfile.TemporaryDirectory() as cache_dir:
+            Log(fp, cache_dir=cache_dir)._log_df
+
+            (cache_fp,) = os.listdir(cache_dir)
+            mode = os.stat(Path(cache_dir, cache_fp)).st_mode
+            self.assertEqual(mode & 0o077, 0)
+
 
 class TestDoctorSession(unittest.TestCase, TestDataMixin):
     def test_ok(self):
@@ -202,6 +276,15 @@ class TestDoctorTask(unittest.TestCase, TestDataMixin):
 
             mock_logger.assert_has_calls(calls)
 
+    def test_task_unknown_type(self):
+        logger = logging.getLogger("test_logger")
+        with patch.object(logger, "error") as mock_logger:
+            fp = self._get_testdata_fp("tasks_invalid_type")
+            instance = Log(fp, logger=logger)
+            instance.doctor()
+
+            mock_logger.assert_not_called()
+
 
 class TestListTasks(unittest.TestCase, TestDataMixin):
     @pytest.fixture(autouse=True)
@@ -222,6 +305,41 @@ task3 (2)
         assert out == expected
 
 
+class TestTaskReport(unittest.TestCase, TestDataMixin, CapSysMixin):
+    def test_task_report(self):
+        fp = self._get_testdata_fp("tasks_multiple_nested_unordered")
+        instance = Log(fp)
+        instance.task_report("task2")
+
+        out, _ = self._capsys.readouterr()
+        self.assertIn("2020-01-01 01:30:00 01:31:00 00:01:00\n", out)
+        self.assertTrue(out.endswith("Total: 0 days 00:01:00\n"))
+
+
+class TestLog(unittest.TestCase, TestDataMixin, CapSysMixin):
+    def test_log_stdout(self):
+        fp = self._get_testdata_fp("session_simple")
+        instance = Log(fp)
+        instance.log(1, use_pager=False, filter_category=None)
+
+        out, _ = self._capsys.readouterr()
+        lines = out.splitlines()
+        self.assertEqual(len(lines), 2)  # header + single entry
+        self.assertIn("01:00:00", lines[1])
+
+    @patch("worklog.log.get_pager", Mock(return_value="less"))
+    @patch("subprocess.Popen")
+    def test_log_pager(self, mock_popen):
+        fp = self._get_testdata_fp("session_simple")
+        instance = Log(fp)
+        instance.log(-1, use_pager=True, filter_category=None)
+
+        self.assertEqual(mock_popen.call_args[0][0], ["less"])
+        lines = list(mock_popen.return_value.stdin.writelines.call_args[0][0])
+        self.assertEqual(len(lines), 3)
+        mock_popen.return_value.wait.assert_called_once()
+
+
 class TestReport(snapshottest.TestCase, TestDataMixin, CapSysMixin):
     def test_report_with_tasks(self):
         fp = self._get_testdata_fp("report_with_tasks")
@@ -318,6 +436,76 @@ class TestStatus(snapshottest.TestCase, TestDataMixin, CapSysMixin):
         out, _ = self._capsys.readouterr()
         self.assertEqual(out, "off")
 
+    def test_leading_orphan_stop(self):
+        # The first entry closes a session that started on the previous day.
+        content = (
+            "2020-01-01 02:00:00+00:00|2020-01-01 02:00:00+00:00|session|stop|\n"
+            "2020-01-01 08:00:00+00:00|2020-01-01 08:00:00+00:00|session|start|\n"
+            "2020-01-01 17:00:00+00:00|2020-01-01 17:00:00+00:00|session|stop|\n"
+        )
+        with patch("worklog.constants.LOCAL_TIMEZONE", new=timezone.utc):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                fp = Path(tmpdir, "log")
+                fp.write_text(content)
+                instance = Log(fp)
+                query_date = date(2020, 1, 1)
+
+                instance.status(8, 10, query_date=query_date, fmt="{total_time}")
+
+        out, _ = self._capsys.readouterr()
+        self.assertEqual(out, "09:00:00")
+
+    def test_stop_after_stop(self):
+        # Each stop entry closes the interval since the previous entry.
+        with patch("worklog.constants.LOCAL_TIMEZONE", new=timezone.utc):
+            fp = self._get_testdata_fp("doctor_session_wrong_order_2")
+            instance = Log(fp)
+            query_date = date(2020, 1, 1)
+
+            instance.status(8, 10, query_date=query_date, fmt="{total_time}")
+
+        out, _ = self._capsys.readouterr()
+        self.assertEqual(out, "03:00:00")
+
+    def test_mixed_utc_offsets(self):
+        # Entries before and after a change to daylight saving time
+        content = (
+            "2020-01-15 22:00:00+01:00|2020-01-15 22:00:00+01:00|session|start|\n"
+            "2020-01-15 23:00:00+01:00|2020-01-15 23:00:00+01:00|session|stop|\n"
+            "2020-07-01 08:00:00+02:00|2020-07-01 08:00:00+02:00|session|start|\n"
+            "2020-07-01 09:00:00+02:00|2020-07-01 09:00:00+02:00|session|stop|\n"
+        )
+        local_tz = timezone(timedelta(hours=2))
+        with patch("worklog.constants.LOCAL_TIMEZONE", new=local_tz):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                fp = Path(tmpdir, "log")
+                fp.write_text(content)
+                instance = Log(fp)
+                query_date = date(2020, 1, 15)
+
+                instance.status(8, 10, query_date=query_date, fmt="{total_time}")
+
+        out, _ = self._capsys.readouterr()
+        self.assertEqual(out, "01:00:00")
+        self.assertEqual(
+            instance._log_df["time"].tolist()[:2], [time(22, 0), time(23, 0)]
+        )
+
+    def test_tracking_on_today_shows_end_of_work(self):
+        today_start = datetime.now(wc.LOCAL_TIMEZONE).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        entry = today_start.isoformat(sep=" ")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fp = Path(tmpdir, "log")
+            fp.write_text(f"{entry}|{entry}|session|start|\n")
+            instance = Log(fp)
+
+            instance.status(8, 10, query_date=today_start.date())
+
+        out, _ = self._capsys.readouterr()
+        self.assertIn("\nEnd of work ", out)
+
     def test_day_with_no_content(self):
         with patch("worklog.constants.LOCAL_TIMEZONE", new=timezone.utc):
             fp = self._get_testdata_fp("status_tracking_off")
@@ -482,3 +670,149 @@ class TestCommit(snapshottest.TestCase, TestDataMixin, CapSysMixin):
 
             content = fh.read().decode()
             self.assertMatchSnapshot(content)
+
+    @patch("worklog.log.now_localtz")
+    def test_backdated_commit(self, mock_now):
+        mock_now.return_value = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        with tempfile.NamedTemporaryFile() as fh:
+            instance = Log(fh.name)
+
+            instance.commit(
+                wc.TOKEN_SESSION, wc.TOKEN_STOP, time="2020-01-01T01:00:00+00:00"
+            )
+            instance.commit(
+                wc.TOKEN_SESSION, wc.TOKEN_START, time="2020-01-01T00:00:00+00:00"
+            )
+
+            fh.seek(0)
+            lines = fh.read().decode().splitlines()
+
+            # the logfile is append-only ...
+            self.assertEqual(len(lines), 2)
+            self.assertTrue(lines[0].endswith("|session|stop|"))
+            # ... but the in-memory log is sorted
+            self.assertListEqual(
+                instance._log_df[wc.COL_TYPE].tolist(), [wc.TOKEN_START, wc.TOKEN_STOP]
+            )
+
+    @patch("worklog.log.now_localtz")
+    def test_commit_with_different_utc_offset(self, mock_now):
+        tz = timezone(timedelta(hours=1))
+        mock_now.return_value = datetime(2020, 1, 1, tzinfo=tz)
+        with patch("worklog.constants.LOCAL_TIMEZONE", new=tz):
+            with tempfile.NamedTemporaryFile() as fh:
+                fh.write(b"2020-01-01 00:00:00+00:00|2020-01-01 00:00:00+00:00|")
+                fh.write(b"session|start|\n")
+                fh.flush()
+                instance = Log(fh.name)
+
+                instance.commit(
+                    wc.TOKEN_SESSION, wc.TOKEN_STOP, time="2020-01-01T03:00:00+01:00"
+                )
+
+                log_dts = instance._log_df[wc.COL_LOG_DATETIME]
+                self.assertEqual(log_dts.dt.tz, tz)
+                self.assertListEqual(
+                    log_dts.tolist(),
+                    [
+                        datetime(2020, 1, 1, 1, tzinfo=tz),
+                        datetime(2020, 1, 1, 3, tzinfo=tz),
+                    ],
+                )
+
+    @patch("worklog.log.now_localtz")
+    def test_backdated_commits_are_inserted(self, mock_now):
+        mock_now.return_value = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fp = Path(tmpdir, "log")
+            fp.write_text(
+                "2020-01-01 00:00:00+00:00|2020-01-01 08:00:00+00:00|session|start|\n"
+                "2020-01-01 00:00:00+00:00|2020-01-01 12:00:00+00:00|session|stop|\n"
+            )
+            instance = Log(fp.as_posix())
+
+            for time_, identifier in [("11:00", "b"), ("09:00", "a"), ("13:00", "c")]:
+                instance.commit(
+                    wc.TOKEN_TASK,
+                    wc.TOKEN_START,
+                    time=f"2020-01-01T{time_}:00+00:00",
+                    identifier=identifier,
+                )
+
+            df = instance._log_df
+            self.assertTrue(df[wc.COL_LOG_DATETIME].is_monotonic_increasing)
+            self.assertListEqual(
+                df[wc.COL_TASK_IDENTIFIER].fillna("-").tolist(),
+                ["-", "a", "b", "-", "c"],
+            )
+
+    @patch("worklog.log.now_localtz")
+    def test_appended_rows_round_trip(self, mock_now):
+        mock_now.return_value = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        with tempfile.NamedTemporaryFile() as fh:
+            instance = Log(fh.name)
+
+            instance.commit(
+                wc.TOKEN_SESSION, wc.TOKEN_START, time="2020-01-01T00:00:00+00:00"
+            )
+            instance.commit(
+                wc.TOKEN_TASK,
+                wc.TOKEN_START,
+                time="2020-01-01T00:30:00+00:00",
+                identifier="task|1",
+            )
+
+            pd.testing.assert_frame_equal(
+                Log(fh.name)._log_df,
+                instance._log_df,
+                check_dtype=False,
+                check_categorical=False,
+            )
+
+    @patch("worklog.log.now_localtz")
+    def test_active_tasks_cache_is_invalidated(self, mock_now):
+        mock_now.return_value = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        with tempfile.NamedTemporaryFile() as fh:
+            instance = Log(fh.name)
+            query_date = date(2020, 1, 1)
+
+            instance.commit(
+                wc.TOKEN_TASK,
+                wc.TOKEN_START,
+                time="2020-01-01T00:00:00+00:00",
+                identifier="task1",
+            )
+            self.assertListEqual(instance._get_active_task_ids(query_date), ["task1"])
+
+            instance.commit(
+                wc.TOKEN_TASK,
+                wc.TOKEN_STOP,
+                time="2020-01-01T01:00:00+00:00",
+                identifier="task1",
+            )
+            self.assertListEqual(instance._get_active_task_ids(query_date), [])
+
+    @patch("worklog.log.now_localtz")
+    def test_task_commit_does_not_read_log(self, mock_now):
+        mock_now.return_value = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_fp = Path(tmpdir, "log")
+            tmp_fp.write_text(
+                "2020-01-01 00:00:00+00:00|2020-01-01 00:00:00+00:00|task|start|task1\n"
+            )
+            instance = Log(tmp_fp.as_posix())
+
+            with patch.object(Log, "_read_csv", wraps=instance._read_csv) as mock_read:
+                instance.commit(
+                    wc.TOKEN_TASK,
+                    wc.TOKEN_START,
+                    time="2020-01-02T00:00:00+00:00",
+                    identifier="task2",
+                )
+                mock_read.assert_not_called()
+
+                df = instance._log_df
+                mock_read.assert_called_once()
+
+            self.assertEqual(df.shape[0], Log(tmp_fp.as_posix())._log_df.shape[0])
+            self.assertEqual(df[wc.COL_TASK_IDENTIFIER].iat[-1], "task2")
@@ -1,4 +1,6 @@
 import unittest
+import subprocess
+import sys
 from unittest.mock import patch
 from io import StringIO
 from argparse import ArgumentParser, ArgumentError, ArgumentTypeError
@@ -31,6 +33,10 @@ class TestParser(unittest.TestCase):
         with self.assertRaises(ArgumentTypeError):
             _positive_int("-5")
 
+    def test_positive_int_with_non_int(self):
+        with self.assertRaises(ValueError):
+            _positive_int("foo")
+
     def test_combined_month_or_day_or_week_parser_value_unknown(self):
         with self.assertRaises(ArgumentTypeError):
             _combined_month_or_day_or_week_parser("foobar")
@@ -150,3 +156,23 @@ class TestParser(unittest.TestCase):
         self.assertEqual(cli_args.subcmd, "log")
         self.assertTrue(cli_args.all)
 
+    def test_parser_is_cached(self):
+        self.assertIs(get_arg_parser(), self.parser)
+
+    def test_only_selected_subcmd_is_populated(self):
+        get_arg_parser.cache_clear()
+        with patch("worklog.parser._populate_report_parser") as mock_report:
+            parser = get_arg_parser()
+            get_arg_parser.cache_clear()
+            parser.parse_args(["log"])
+
+        mock_report.assert_not_called()
+
+    def test_cli_startup_does_not_import_pandas(self):
+        code = (
+            "import sys, worklog; "
+            "worklog.get_arg_parser(); worklog.configure_logger(); "
+            "sys.exit('pandas' in sys.modules)"
+        )
+        result = subprocess.run([sys.executable, "-c", code])
+        self.assertEqual(result.returncode, 0)
@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import patch
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+from worklog.utils.config import load_config
+
+
+class TestConfig(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.cfg_fp = Path(self._tmpdir.name, "config").as_posix()
+        self.missing_fp = Path(self._tmpdir.name, "missing").as_posix()
+        self.cache_fp = Path(self._tmpdir.name, "cache", "cfg.pkl").as_posix()
+        self._write_cfg("[worklog]\npath = ~/.worklog\n")
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def _write_cfg(self, content: str, mtime_ns: int = 10 ** 18):
+        with open(self.cfg_fp, "w") as fh:
+            fh.write(content)
+        os.utime(self.cfg_fp, ns=(mtime_ns, mtime_ns))
+
+    def test_load_without_cache(self):
+        cfg = load_config([self.cfg_fp, self.missing_fp], cache_fp=None)
+
+        self.assertEqual(cfg.get("worklog", "path"), "~/.worklog")
+        self.assertFalse(Path(self.cache_fp).exists())
+
+    def test_cache_is_written(self):
+        load_config([self.cfg_fp, self.missing_fp], cache_fp=self.cache_fp)
+
+        self.assertTrue(Path(self.cache_fp).exists())
+
+    def test_cache_is_used(self):
+        load_config([self.cfg_fp], cache_fp=self.cache_fp)
+
+        with patch("configparser.ConfigParser.read") as mock_read:
+            cfg = load_config([self.cfg_fp], cache_fp=self.cache_fp)
+
+        mock_read.assert_not_called()
+        self.assertEqual(cfg.get("worklog", "path"), "~/.worklog")
+
+    def test_cache_is_invalidated_on_change(self):
+        load_config([self.cfg_fp], cache_fp=self.cache_fp)
+        self._write_cfg("[worklog]\npath = ~/.other\n", mtime_ns=2 * 10 ** 18)
+
+        cfg = load_config([self.cfg_fp], cache_fp=self.cache_fp)
+
+        self.assertEqual(cfg.get("worklog", "path"), "~/.other")
+
+    def test_corrupt_cache_is_ignored(self):
+        Path(self.cache_fp).parent.mkdir()
+        Path(self.cache_fp).write_bytes(b"not a pickle")
+
+        cfg = load_config([self.cfg_fp], cache_fp=self.cache_fp)
+
+        self.assertEqual(cfg.get("worklog", "path"), "~/.worklog")
+
+    def test_foreign_pickle_is_ignored(self):
+        Path(self.cache_fp).parent.mkdir()
+        for obj in (42, ("signature",), [1, 2, 3]):
+            Path(self.cache_fp).write_bytes(pickle.dumps(obj))
+
+            cfg = load_config([self.cfg_fp], cache_fp=self.cache_fp)
+
+            self.assertEqual(cfg.get("worklog", "path"), "~/.worklog")
@@ -3,7 +3,11 @@ from datetime import timedelta
 import numpy as np
 import pandas as pd
 
-from worklog.utils.formatting import format_timedelta
+from worklog.utils.formatting import (
+    format_timedelta,
+    format_timedeltas,
+    iter_table_lines,
+)
 
 
 class TestTimeFormatting(unittest.TestCase):
@@ -55,3 +59,39 @@ class TestTimeFormatting(unittest.TestCase):
         expected = "480:00:00"
 
         self.assertEqual(actual, expected)
+
+    def test_format_timedelta_negative(self):
+        self.assertEqual(format_timedelta(timedelta(minutes=-90)), "-01:30:00")
+        self.assertEqual(format_timedelta(np.timedelta64(-100, "s")), "-00:01:40")
+
+    def test_format_timedeltas(self):
+        values = pd.Series(
+            [timedelta(hours=1, minutes=5, seconds=30), pd.NaT, timedelta(days=2)]
+        )
+        actual = format_timedeltas(values).tolist()
+        expected = ["01:05:30", "00:00:00", "48:00:00"]
+
+        self.assertListEqual(actual, expected)
+
+    def test_format_timedeltas_negative(self):
+        values = pd.Series([timedelta(seconds=-30), timedelta(minutes=-90)])
+        actual = format_timedeltas(values).tolist()
+        expected = [format_timedelta(value) for value in values]
+
+        self.assertListEqual(actual, expected)
+        self.assertListEqual(actual, ["-00:00:30", "-01:30:00"])
+
+
+class TestTableFormatting(unittest.TestCase):
+    def test_iter_table_lines(self):
+        df = pd.DataFrame({"type": ["start", "stop"], "identifier": ["-", "task1"]})
+
+        actual = list(iter_table_lines(df))
+
+        expected = [
+            " type identifier\n",
+            "start          -\n",
+            " stop      task1\n",
+        ]
+        self.assertListEqual(actual, expected)
+        self.assertEqual("".join(actual), df.to_string(index=False) + "\n")
@@ -1,7 +1,11 @@
 import unittest
 import numpy as np
 
-from worklog.utils.schema import empty_df_from_schema, get_datetime_cols_from_schema
+from worklog.utils.schema import (
+    build_schema,
+    empty_df_from_schema,
+    get_datetime_cols_from_schema,
+)
 
 
 class TestSchema(unittest.TestCase):
@@ -30,3 +34,15 @@ class TestSchema(unittest.TestCase):
 
         actual = get_datetime_cols_from_schema(schema)
         self.assertListEqual(["commit_dt", "log_dt"], actual)
+
+    def test_build_schema(self):
+        schema = [
+            ("commit_dt", "datetime64[ns]",),
+            ("log_dt", "datetime64[ns]",),
+            ("category", "object",),
+        ]
+
+        df, datetime_cols = build_schema(schema)
+        self.assertListEqual(df.columns.tolist(), ["commit_dt", "log_dt", "category"])
+        self.assertTupleEqual(df.shape, (0, len(schema)))
+        self.assertListEqual(["commit_dt", "log_dt"], datetime_cols)
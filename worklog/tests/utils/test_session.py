@@ -115,6 +115,11 @@ class TestSentinelEntries(unittest.TestCase):
                 target_date4 = date(2020, 1, 3)
                 sentinel_datetime(target_date4)
 
+    def test_sentinel_datetime_given_now(self):
+        now = datetime(2020, 1, 2, 1, 33, 7, 0, timezone.utc)
+        actual = sentinel_datetime(date(2020, 1, 2), now)
+        self.assertEqual(actual, now)
+
 
 class TestSessionActivity(unittest.TestCase):
     def test_inactive_session(self):
@@ -127,6 +127,32 @@ class TestTaskIntervals(unittest.TestCase):
             "Found unknown type 'unknown'. Skip entry."
         )
 
+    def test_extract_intervals_invalid_multiple(self):
+        mock_logger = Mock(logging.Logger)
+        types = [wc.TOKEN_STOP, wc.TOKEN_START, wc.TOKEN_START, wc.TOKEN_STOP]
+        types += [wc.TOKEN_STOP, wc.TOKEN_START]
+        df = DataFrame(
+            {
+                wc.COL_LOG_DATETIME: pd.date_range(
+                    "2020-01-01", periods=len(types), freq="H", tz="UTC"
+                ),
+                wc.COL_TYPE: types,
+            }
+        )
+
+        actual = extract_intervals(df, logger=mock_logger)
+        expected = DataFrame(
+            {
+                "date": [date(2020, 1, 1)],
+                "start": [datetime(2020, 1, 1, 2, tzinfo=timezone.utc)],
+                "stop": [datetime(2020, 1, 1, 3, tzinfo=timezone.utc)],
+                "interval": [timedelta(hours=1)],
+            }
+        )
+
+        pd.testing.assert_frame_equal(actual, expected, check_freq=False)
+        self.assertEqual(mock_logger.error.call_count, 4)
+
 
 class TestTaskDuration(unittest.TestCase):
     def test_calc_task_durations_ordered(self):
@@ -1,11 +1,19 @@
 import unittest
 from unittest.mock import patch, Mock
-from datetime import date, time, datetime, timezone
+from datetime import date, time, datetime, timezone, timedelta
 from pandas import DataFrame
 import pandas as pd
 
 import worklog.constants as wc
-from worklog.utils.time import _get_or_update_dt, calc_log_time, extract_date_and_time
+from worklog.utils.time import (
+    _get_or_update_dt,
+    assign_date_and_time,
+    calc_log_time,
+    extract_date_and_time,
+    parse_datetimes,
+    parse_datetimes_with_date_and_time,
+    now_localtz,
+)
 from worklog.tests.utils import read_log_sample
 
 
@@ -21,6 +29,12 @@ class TestDatetimeManipulation(unittest.TestCase):
 
         self.assertEqual(actual, expected)
 
+    def test_get_or_update_dt_with_invalid_time(self):
+        dt = datetime(2020, 1, 1, 0, 0, 0, tzinfo=wc.LOCAL_TIMEZONE)
+
+        with self.assertRaises(ValueError):
+            _get_or_update_dt(dt, "25:00")
+
     def test_get_or_update_dt_with_iso_datestr(self):
         dt = datetime(2020, 1, 1, 0, 0, 0, tzinfo=wc.LOCAL_TIMEZONE)
 
@@ -77,6 +91,13 @@ class TestDatetimeManipulation(unittest.TestCase):
         mock.assert_not_called()
         self.assertEqual(actual, expected)
 
+    @patch("worklog.constants.LOCAL_TIMEZONE", new=timezone(timedelta(hours=2)))
+    def test_now_localtz(self):
+        actual = now_localtz()
+
+        self.assertEqual(actual.utcoffset(), timedelta(hours=2))
+        self.assertEqual(actual.microsecond, 0)
+
 
 class TestDateTimeExtraction(unittest.TestCase):
     def test_extraction(self):
@@ -91,3 +112,83 @@ class TestDateTimeExtraction(unittest.TestCase):
         actual = extract_date_and_time(df)
 
         pd.testing.assert_frame_equal(actual, expected)
+
+    def test_assignment(self):
+        df = read_log_sample("session_simple")
+        expected = extract_date_and_time(df)
+
+        assign_date_and_time(df)
+
+        pd.testing.assert_frame_equal(df[["date", "time"]], expected)
+
+    @patch("worklog.constants.LOCAL_TIMEZONE", new=timezone.utc)
+    def test_extraction_object_dtype(self):
+        """Date and time are taken in the UTC offset of each entry."""
+        df = DataFrame(
+            {
+                wc.COL_LOG_DATETIME: [
+                    datetime(2020, 1, 1, 23, tzinfo=timezone(timedelta(hours=-1))),
+                    datetime(2020, 1, 2, 1, tzinfo=timezone(timedelta(hours=1))),
+                ]
+            },
+            dtype=object,
+        )
+
+        expected = DataFrame(
+            {
+                "date": [date(2020, 1, 1), date(2020, 1, 2)],
+                "time": [time(23, 0, 0), time(1, 0, 0)],
+            }
+        )
+        actual = extract_date_and_time(df)
+
+        pd.testing.assert_frame_equal(actual, expected)
+
+
+class TestParseDatetimes(unittest.TestCase):
+    def test_same_offset(self):
+        actual = parse_datetimes(
+            ["2020-01-01 00:00:00+00:00", "2020-01-01 01:00:00+00:00"]
+        )
+
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(actual))
+        self.assertEqual(
+            actual.tolist(),
+            [
+                datetime(2020, 1, 1, 0, tzinfo=timezone.utc),
+                datetime(2020, 1, 1, 1, tzinfo=timezone.utc),
+            ],
+        )
+
+    @patch("worklog.constants.LOCAL_TIMEZONE", new=timezone(timedelta(hours=1)))
+    def test_mixed_offsets(self):
+        actual = parse_datetimes(
+            ["2020-01-01 00:00:00+01:00", "2020-06-01 00:00:00+02:00"]
+        )
+
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(actual))
+        self.assertEqual(
+            actual.tolist(),
+            [
+                datetime(2020, 1, 1, 0, tzinfo=timezone(timedelta(hours=1))),
+                datetime(2020, 5, 31, 23, tzinfo=timezone(timedelta(hours=1))),
+            ],
+        )
+
+    @patch("worklog.constants.LOCAL_TIMEZONE", new=timezone(timedelta(hours=2)))
+    def test_mixed_offsets_date_and_time(self):
+        _, actual_date, actual_time = parse_datetimes_with_date_and_time(
+            ["2020-01-15 23:00:00+01:00", "2020-06-01 00:00:00+02:00"]
+        )
+
+        self.assertEqual(actual_date.tolist(), [date(2020, 1, 15), date(2020, 6, 1)])
+        self.assertEqual(actual_time.tolist(), [time(23, 0), time(0, 0)])
+
+    def test_missing_value_in_fallback(self):
+        """Missing values are NaT also if the values deviate from the format."""
+        actual = parse_datetimes(
+            ["2020-01-01 00:00:00.500000+00:00", None, "2020-01-01 01:00:00+00:00"]
+        )
+
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(actual))
+        self.assertTrue(pd.isna(actual.iat[1]))
@@ -0,0 +1,69 @@
+from typing import Dict, List, Optional, Tuple
+from configparser import ConfigParser
+import os
+import pickle
+
+import worklog.constants as wc
+
+Signature = Tuple[Tuple[str, Optional[int]], ...]
+
+
+def load_config(
+    paths: List[str], cache_fp: Optional[str] = wc.CONFIG_CACHE_FILE
+) -> ConfigParser:
+    """
+    Reads the configuration files in the given order.
+    The parsed content is cached in `cache_fp` and re-used as long as none of
+    the configuration files has been added, removed or modified since.
+    """
+    cfg = ConfigParser()
+    signature = _config_signature(paths)
+    content = _read_cache(cache_fp, signature) if cache_fp is not None else None
+    if content is not None:
+        cfg.read_dict(content)
+        return cfg
+
+    cfg.read(paths)
+    if cache_fp is not None:
+        content = {
+            section: dict(cfg.items(section, raw=True)) for section in cfg.sections()
+        }
+        _write_cache(cache_fp, signature, content)
+    return cfg
+
+
+def _config_signature(paths: List[str]) -> Signature:
+    def mtime(path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    return tuple((path, mtime(path)) for path in paths)
+
+
+def _read_cache(
+    cache_fp: str, signature: Signature
+) -> Optional[Dict[str, Dict[str, str]]]:
+    try:
+        with open(cache_fp, "rb") as fh:
+            cached_signature, content = pickle.load(fh)
+    except Exception:
+        # A truncated or foreign cache file can fail in many ways, e.g. if
+        # the unpickled object is not a (signature, content) pair. Caching is
+        # optional, so fall back to parsing the config files.
+        return None
+    if cached_signature != signature or not isinstance(content, dict):
+        return None
+    return content
+
+
+def _write_cache(
+    cache_fp: str, signature: Signature, content: Dict[str, Dict[str, str]]
+) -> None:
+    try:
+        os.makedirs(os.path.dirname(cache_fp), exist_ok=True)
+        with open(cache_fp, "wb") as fh:
+            pickle.dump((signature, content), fh)
+    except OSError:
+        pass  # caching is optional, the config files remain the source of truth
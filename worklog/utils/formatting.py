@@ -1,8 +1,7 @@
-from typing import Union, Optional
+from typing import Iterator, Union, Optional
 from datetime import timedelta
 import pandas as pd
 import numpy as np
-from math import floor
 
 
 def format_timedelta(value: Optional[Union[timedelta, np.timedelta64]]) -> str:
@@ -16,24 +15,57 @@ def format_timedelta(value: Optional[Union[timedelta, np.timedelta64]]) -> str:
         raise ValueError("value must be either a Python or a numpy timedelta instance")
 
 
+def format_timedeltas(values: pd.Series) -> pd.Series:
+    """
+    Vectorized version of `format_timedelta` for a Series of timedeltas.
+    Missing values are formatted as `00:00:00`.
+    """
+    total_secs = pd.to_timedelta(values).dt.total_seconds().fillna(0)
+    total_secs = total_secs.astype(np.int64)
+    # Same as `_format_seconds`: format the absolute value, prefixed by sign
+    sign = (total_secs < 0).map({True: "-", False: ""})
+    hours, remainder = np.divmod(total_secs.abs(), 3600)
+    minutes, seconds = np.divmod(remainder, 60)
+    return (
+        sign
+        + hours.astype(str).str.zfill(2)
+        + ":"
+        + minutes.astype(str).str.zfill(2)
+        + ":"
+        + seconds.astype(str).str.zfill(2)
+    )
+
+
+def iter_table_lines(df: pd.DataFrame) -> Iterator[str]:
+    """
+    Yields the content of a DataFrame line by line, starting with the header.
+    Columns are right-aligned and separated by a single space, similar to
+    `DataFrame.to_string(index=False)`.
+    """
+    values = [[str(value) for value in df[col]] for col in df.columns]
+    widths = [
+        max([len(str(col))] + [len(value) for value in col_values])
+        for col, col_values in zip(df.columns, values)
+    ]
+    fmt = " ".join(f"{{:>{width}}}" for width in widths) + "\n"
+    yield fmt.format(*df.columns)
+    for row in zip(*values):
+        yield fmt.format(*row)
+
+
 def _format_timedelta_py(td: timedelta) -> str:
-    try:
-        total_secs = td.total_seconds()
-        hours, remainder = divmod(total_secs, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        return "{:02}:{:02}:{:02}".format(int(hours), int(minutes), int(seconds))
-    except (AttributeError, ValueError):
-        return "{:02}:{:02}:{:02}".format(0, 0, 0)
+    return _format_seconds(int(td.total_seconds()))
 
 
 def _format_timedelta_np(value: np.timedelta64) -> str:
-    seconds = value / np.timedelta64(1, "s")
-    if np.isnan(seconds):
-        hours = minutes = seconds = 0
-    else:
-        hours = floor(seconds / 3600)
-        minutes = floor((seconds - hours * 3600) / 60)
-        seconds = floor(seconds % 60)
-    return "{hours:02}:{minutes:02}:{seconds:02}".format(
-        hours=hours, minutes=minutes, seconds=seconds
-    )
+    if np.isnat(value):
+        return _format_seconds(0)
+    return _format_seconds(int(value // np.timedelta64(1, "s")))
+
+
+def _format_seconds(total_secs: int) -> str:
+    sign = "-" if total_secs < 0 else ""
+    secs = abs(total_secs)
+    hours, secs = secs // 3600, secs % 3600
+    minutes, secs = secs // 60, secs % 60
+    return f"{sign}{hours:02d}:{minutes:02d}:{secs:02d}"
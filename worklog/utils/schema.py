@@ -1,20 +1,25 @@
-from typing import Iterable, Tuple, Dict, List
+from typing import Dict, Iterable, Tuple, List
 from pandas import DataFrame, Series
-from functools import reduce
 
 
-def empty_df_from_schema(schema: Iterable[Tuple[str, str]]) -> DataFrame:
-    def reducer(acc: Dict, x: Tuple[str, str]):
-        acc[x[0]] = Series(dtype=x[1])
-        return acc
+def build_schema(schema: Iterable[Tuple[str, str]]) -> Tuple[DataFrame, List[str]]:
+    """
+    Returns an empty DataFrame following the schema together with the names
+    of its datetime columns, computed in a single pass over the schema.
+    """
+    columns: Dict[str, Series] = {}
+    datetime_cols: List[str] = []
+    for name, dtype in schema:
+        columns[name] = Series(dtype=dtype)
+        if "datetime" in dtype:
+            datetime_cols.append(name)
+    return DataFrame(columns), datetime_cols
+
 
-    return DataFrame(reduce(reducer, schema, {}))
+def empty_df_from_schema(schema: Iterable[Tuple[str, str]]) -> DataFrame:
+    return build_schema(schema)[0]
 
 
 def get_datetime_cols_from_schema(schema: Iterable[Tuple[str, str]]) -> List[str]:
-    def reducer(acc: List, x: Tuple[str, str]):
-        if "datetime" in x[1]:
-            acc.append(x[0])
-        return acc
-
-    return reduce(reducer, schema, [])
+    # Does not delegate to build_schema, no DataFrame is needed here.
+    return [name for name, dtype in schema if "datetime" in dtype]
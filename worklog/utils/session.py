@@ -1,8 +1,8 @@
 from typing import Optional
-from pandas import DataFrame, Series
-import numpy as np
-from datetime import datetime, date, timezone, tzinfo
+from pandas import DataFrame
+from datetime import datetime, date, tzinfo
 import logging
+from functools import lru_cache
 
 import worklog.constants as wc
 from worklog.errors import ErrMsg
@@ -11,18 +11,15 @@ from worklog.errors import ErrMsg
 def check_order_session(
     df_group: DataFrame, logger: logging.Logger, task_id: str = None
 ):
-    mask_start = df_group[wc.COL_TYPE] == wc.TOKEN_START
-    mask_stop = df_group[wc.COL_TYPE] == wc.TOKEN_STOP
+    # Work on the plain numpy arrays, no index alignment is needed here.
+    types = df_group[wc.COL_TYPE].values
+    mask_start = types == wc.TOKEN_START
+    mask_stop = types == wc.TOKEN_STOP
+    n_start, n_stop = mask_start.sum(), mask_stop.sum()
 
-    # Roll start_mask series n -> n+1, but keep the index the same.
-    # This can be used to later compare if both, the shifted start_mask series
-    # and the mask_stop series are the same, which must be the case if both
-    # only contain alternating values as it should be in a healthy log.
-    shifted_mask_start = Series(np.roll(mask_start.values, 1), index=mask_start.index)
+    date = df_group["date"].iat[0]
 
-    date = df_group.date.iloc[0]
-
-    if mask_start.sum() < mask_stop.sum():
+    if n_start < n_stop:
         if task_id is None:
             logger.error(
                 ErrMsg.MISSING_SESSION_ENTRY.value.format(
@@ -35,7 +32,7 @@ def check_order_session(
                     type=wc.TOKEN_START, date=date, task_id=task_id
                 )
             )
-    elif mask_start.sum() > mask_stop.sum():
+    elif n_start > n_stop:
         if task_id is None:
             logger.error(
                 ErrMsg.MISSING_SESSION_ENTRY.value.format(type=wc.TOKEN_STOP, date=date)
@@ -46,10 +43,10 @@ def check_order_session(
                     type=wc.TOKEN_STOP, date=date, task_id=task_id
                 )
             )
-    # First compare if the first entry is a start entry and then see if both
-    # the shifted_start_mask series and the mask_stop series have the same
-    # values. See above for an explanation.
-    elif int(mask_start.iloc[0]) != 1 or not shifted_mask_start.equals(mask_stop):
+    # With matching counts the log is healthy if it starts with a start entry
+    # and every stop entry directly follows a start entry and vice versa,
+    # i.e. the start and stop entries alternate.
+    elif not mask_start[0] or (mask_start[:-1] != mask_stop[1:]).any():
         if task_id is None:
             logger.error(ErrMsg.WRONG_SESSION_ORDER.value.format(date=date))
         else:
@@ -58,23 +55,19 @@ def check_order_session(
             )
 
 
-def sentinel_datetime(target_date: date) -> datetime:
-    if target_date > datetime.now().date():
+def sentinel_datetime(target_date: date, now: Optional[datetime] = None) -> datetime:
+    if now is None:
+        now = datetime.now(wc.LOCAL_TIMEZONE).replace(microsecond=0)
+    if target_date > now.date():
         raise ValueError("Only dates on the same day or in the past are supported.")
-    return min(
-        datetime.now(timezone.utc)
-        .astimezone(tz=wc.LOCAL_TIMEZONE)
-        .replace(microsecond=0),
-        datetime(
-            target_date.year,
-            target_date.month,
-            target_date.day,
-            23,
-            59,
-            59,
-            0,
-            wc.LOCAL_TIMEZONE,
-        ).astimezone(tz=wc.LOCAL_TIMEZONE),
+    return min(now, _end_of_day(target_date, wc.LOCAL_TIMEZONE))
+
+
+@lru_cache(maxsize=32)
+def _end_of_day(target_date: date, tz: Optional[tzinfo]) -> datetime:
+    """Returns the last second of the given date."""
+    return datetime(
+        target_date.year, target_date.month, target_date.day, 23, 59, 59, 0, tz,
     )
 
 
@@ -85,4 +78,4 @@ def is_active_session(df: DataFrame):
 
     Note: Make sure to apply this method only on a sorted DataFrame.
     """
-    return df.iloc[-1][wc.COL_TYPE] == wc.TOKEN_START if df.shape[0] > 0 else False
+    return df.shape[0] > 0 and df[wc.COL_TYPE].iat[-1] == wc.TOKEN_START
@@ -1,6 +1,6 @@
 from typing import List, Optional
-from pandas import DataFrame
-from datetime import datetime
+from pandas import DataFrame, Series
+import numpy as np
 import logging
 
 import worklog.constants as wc
@@ -52,51 +52,70 @@ def get_active_task_ids(df: DataFrame):
     Note: This method can only handle DataFrames that have entries where the
     category is set to 'task'.
     """
-    df = df[[wc.COL_LOG_DATETIME, wc.COL_TYPE, wc.COL_TASK_IDENTIFIER]].sort_values(
-        by=[wc.COL_LOG_DATETIME]
-    )
+    if not df[wc.COL_LOG_DATETIME].is_monotonic_increasing:
+        df = df.sort_values(by=[wc.COL_LOG_DATETIME])
 
-    df_grouped = df.groupby(wc.COL_TASK_IDENTIFIER).tail(1)
-    return sorted(
-        df_grouped[df_grouped[wc.COL_TYPE] == wc.TOKEN_START][
-            wc.COL_TASK_IDENTIFIER
-        ].unique()
-    )
+    last_types = df.groupby(wc.COL_TASK_IDENTIFIER, sort=False)[wc.COL_TYPE].last()
+    return sorted(last_types.index[last_types.values == wc.TOKEN_START])
 
 
 def extract_intervals(
     df: DataFrame, logger: Optional[logging.Logger] = None,
 ):
+    columns = ["date", "start", "stop", "interval"]
+    if df.shape[0] == 0:
+        return DataFrame(columns=columns)
+
+    types = df[wc.COL_TYPE].values
+    log_dts = df[wc.COL_LOG_DATETIME]
+
+    # Fast path: In a healthy log start and stop entries alternate, which
+    # allows to pair them by position.
+    if (
+        df.shape[0] % 2 == 0
+        and (types[0::2] == wc.TOKEN_START).all()
+        and (types[1::2] == wc.TOKEN_STOP).all()
+    ):
+        return _build_intervals(log_dts.iloc[0::2], log_dts.iloc[1::2])
+
     def log_error(msg):
         if logger:
             logger.error(msg)
 
-    intervals = []
-    last_start: Optional[datetime] = None
-    for i, row in df.iterrows():
-        if row[wc.COL_TYPE] == wc.TOKEN_START:
-            if last_start is not None:
-                log_error(f"Start entry at {last_start} has no stop entry. Skip entry.")
-            last_start = row[wc.COL_LOG_DATETIME]
-        elif row[wc.COL_TYPE] == wc.TOKEN_STOP:
-            if last_start is None:
-                log_error("No start entry found. Skip entry.")
-                continue  # skip this entry
-            td = row[wc.COL_LOG_DATETIME] - last_start
-            d = last_start.date()
-            intervals.append(
-                {
-                    "date": d,
-                    "start": last_start,
-                    "stop": row[wc.COL_LOG_DATETIME],
-                    "interval": td,
-                }
-            )
-            last_start = None
-        else:
-            log_error(f"Found unknown type '{row['type']}'. Skip entry.")
-            continue
-    if last_start is not None:
-        log_error(f"Start entry at {last_start} has no stop entry. Skip entry.")
-
-    return DataFrame(intervals, columns=["date", "start", "stop", "interval"])
+    mask_start = types == wc.TOKEN_START
+    mask_known = mask_start | (types == wc.TOKEN_STOP)
+    for type_ in types[~mask_known]:
+        log_error(f"Found unknown type '{type_}'. Skip entry.")
+
+    # Every start entry opens a new group which is closed by the first
+    # following stop entry. Further stop entries in the same group and stop
+    # entries before the first start entry have no matching start entry.
+    group = np.cumsum(mask_start)[mask_known]
+    entries = log_dts[mask_known]
+    pos = entries.groupby(group).cumcount().values
+    for _ in range(np.count_nonzero((group == 0) | (pos > 1))):
+        log_error("No start entry found. Skip entry.")
+
+    mask_pair_start = (group > 0) & (pos == 0)
+    mask_pair_stop = (group > 0) & (pos == 1)
+    starts = entries[mask_pair_start].set_axis(group[mask_pair_start])
+    stops = entries[mask_pair_stop].set_axis(group[mask_pair_stop])
+    for start in starts[~np.isin(starts.index, stops.index)]:
+        log_error(f"Start entry at {start} has no stop entry. Skip entry.")
+
+    if stops.shape[0] == 0:
+        return DataFrame(columns=columns)
+    return _build_intervals(starts[stops.index], stops)
+
+
+def _build_intervals(starts: Series, stops: Series) -> DataFrame:
+    starts = starts.reset_index(drop=True)
+    stops = stops.reset_index(drop=True)
+    return DataFrame(
+        {
+            "date": starts.dt.date,
+            "start": starts,
+            "stop": stops,
+            "interval": stops - starts,
+        }
+    )
@@ -1,21 +1,29 @@
-from typing import Optional
-from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta
+import re
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype  # type: ignore
 
 import worklog.constants as wc
 
+# Matches a time of the format 'hh:mm', same as strptime with '%H:%M'
+_re_hour_minute = re.compile(r"^(\d{1,2}):(\d{1,2})$")
+
+# Format of datetimes in the logfile without the UTC offset
+_wall_clock_format = wc.DATETIME_FORMAT.replace("%z", "")
+
 
 def _get_or_update_dt(dt: datetime, time: str):
-    try:
-        h_time = datetime.strptime(time, "%H:%M")
-        hour, minute = h_time.hour, h_time.minute
+    match = _re_hour_minute.match(time)
+    if match is not None:
+        hour, minute = int(match.group(1)), int(match.group(2))
         return dt.replace(hour=hour, minute=minute, second=0)
-    except ValueError:
-        h_time = datetime.fromisoformat(time).replace(second=0)
-        if h_time.tzinfo is None:
-            # Set local timezone if not defined explicitly.
-            h_time = h_time.replace(tzinfo=wc.LOCAL_TIMEZONE)
-        return h_time
+
+    h_time = datetime.fromisoformat(time).replace(second=0)
+    if h_time.tzinfo is None:
+        # Set local timezone if not defined explicitly.
+        h_time = h_time.replace(tzinfo=wc.LOCAL_TIMEZONE)
+    return h_time
 
 
 def calc_log_time(offset_min: int = 0, time: Optional[str] = None) -> datetime:
@@ -23,12 +31,9 @@ def calc_log_time(offset_min: int = 0, time: Optional[str] = None) -> datetime:
     Calculates the log time based on the current timestamp and either an
     offset or a time correction.
     """
-    my_date = (
-        datetime.now(timezone.utc)
-        .astimezone(tz=wc.LOCAL_TIMEZONE)
-        .replace(microsecond=0)
-    )
-    my_date = my_date + timedelta(minutes=offset_min)
+    my_date = now_localtz()
+    if offset_min:
+        my_date += timedelta(minutes=offset_min)
 
     if time is not None:
         my_date = _get_or_update_dt(my_date, time)
@@ -43,15 +48,105 @@ def extract_date_and_time(
     Extracts date and time information from a given pandas DataFrame.
     By default the source column is `log_dt`.
     """
-    date: pd.Series = df[source_col].apply(lambda x: x.date)
-    time: pd.Series = df[source_col].apply(lambda x: x.time)
+    date, time = _split_date_and_time(df[source_col])
     return pd.DataFrame(dict(date=date, time=time),)
 
 
-def now_localtz() -> datetime:
-    return (
-        datetime.now(timezone.utc)
-        .astimezone(tz=wc.LOCAL_TIMEZONE)
-        .replace(microsecond=0)
+def assign_date_and_time(
+    df: pd.DataFrame, source_col: str = wc.COL_LOG_DATETIME
+) -> None:
+    """
+    Same as `extract_date_and_time` but adds the columns `date` and `time`
+    to the given DataFrame in place.
+    """
+    df["date"], df["time"] = _split_date_and_time(df[source_col])
+
+
+def _split_date_and_time(dts: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    if is_datetime64_any_dtype(dts):
+        return dts.dt.date, dts.dt.time
+    # e.g. a column of datetimes with different UTC offsets. Use the date and
+    # time of each value in its own offset, i.e. its wall-clock time.
+    # Missing values become NaT, same as with the `dt` accessor.
+    missing = dts.isna().values
+    date = pd.Series(
+        [pd.NaT if na else dt.date() for dt, na in zip(dts, missing)],
+        index=dts.index,
+        dtype=object,
     )
+    time = pd.Series(
+        [pd.NaT if na else dt.time() for dt, na in zip(dts, missing)],
+        index=dts.index,
+        dtype=object,
+    )
+    return date, time
+
+
+def parse_datetimes(values: List[str]) -> pd.Series:
+    """
+    Parses a list of ISO formatted datetime strings into a pandas Series.
+    If the values do not share the same UTC offset, e.g. because of daylight
+    saving time, all values are converted to the local timezone.
+    """
+    dts, _ = _parse_datetimes(values)
+    return dts
+
+
+def parse_datetimes_with_date_and_time(
+    values: List[str],
+) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    """
+    Same as `parse_datetimes`, but additionally returns the date and time of
+    each value in its own UTC offset, i.e. as it has been logged. Unlike the
+    parsed datetimes, these are not affected by the conversion of values with
+    different UTC offsets.
+    """
+    dts, wall_clock = _parse_datetimes(values)
+    date, time = _split_date_and_time(wall_clock)
+    return dts, date, time
+
+
+def _parse_datetimes(values: List[str]) -> Tuple[pd.Series, pd.Series]:
+    """
+    Returns the parsed datetimes and a Series from which the wall-clock date
+    and time of each value can be taken.
+    """
+    s = pd.Series(values)
+    try:
+        # An explicit format avoids pandas' format inference.
+        dts = pd.to_datetime(s, format=wc.DATETIME_FORMAT)
+        if is_datetime64_any_dtype(dts):
+            return dts, dts
+        # Different UTC offsets end up as single datetime objects. Parse
+        # them as UTC instead to stay on the vectorized path. The wall-clock
+        # times are parsed separately with the UTC offset stripped off,
+        # e.g. '+01:00'.
+        dts = pd.to_datetime(s, format=wc.DATETIME_FORMAT, utc=True)
+        wall_clock = pd.to_datetime(s.str.slice(stop=-6), format=_wall_clock_format)
+        return dts.dt.tz_convert(wc.LOCAL_TIMEZONE), wall_clock
+    except ValueError:
+        # Values that deviate from the default format, e.g. fractional
+        # seconds. Missing values become NaT, same as on the strict path.
+        dts = pd.Series(
+            [
+                datetime.fromisoformat(value) if value else pd.NaT
+                for value in values
+            ]
+        )
+        return normalize_datetimes(dts), dts
+
+
+def normalize_datetimes(s: pd.Series) -> pd.Series:
+    """
+    Converts a Series of timezone aware datetimes to a datetime dtype.
+    Values with different UTC offsets are converted to the local timezone.
+    """
+    try:
+        return pd.to_datetime(s)
+    except ValueError:
+        return pd.to_datetime(s, utc=True).dt.tz_convert(wc.LOCAL_TIMEZONE)
+
+
+def now_localtz() -> datetime:
+    return datetime.now(wc.LOCAL_TIMEZONE).replace(microsecond=0)
 